@@ -1,33 +1,182 @@
-import pandas as pd
+"""
+Baseline Random Forest com o mesmo pré-processamento do NEAT.
+
+Usa ``feature_engineering.load_features`` (feature store, .npy ou CSV),
+SELECTED_COLUMNS, a mesma partição treino/teste e o StandardScaler ajustado
+no treino, de modo que acurácia e throughput sejam comparáveis aos de
+``neat/train.py``. As árvores são treinadas em paralelo em todos os núcleos.
+
+Com ``--chunk-rows`` o treino é out-of-core: os dados são lidos em blocos
+(``iter_features``) e cada bloco acrescenta árvores à floresta via
+``warm_start``; 1 a cada 5 linhas fica reservada para teste.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils"))
+from feature_engineering import SELECTED_COLUMNS, load_features, iter_features
+from model_bundle import ModelBundle
 
 # === CONFIG ===
-DATA_PATH = "data/go_arounds_augmented.csv"
+BUNDLE_PATH = "baseline/rf_bundle.npz"
+N_ESTIMATORS = 100
+RANDOM_STATE = 42
+TEST_EVERY = 5
+
+def fit_forest(X, y, n_estimators=N_ESTIMATORS, n_jobs=-1, random_state=RANDOM_STATE, **params):
+    """
+    Treina a floresta em memória, com as árvores distribuídas em ``n_jobs`` processos.
+
+    Returns:
+        RandomForestClassifier: Modelo treinado
+    """
+    clf = RandomForestClassifier(n_estimators=n_estimators, n_jobs=n_jobs,
+                                 random_state=random_state, **params)
+    return clf.fit(X, y)
+
+def train_in_memory(n_estimators=N_ESTIMATORS, n_jobs=-1, **params):
+    """
+    Treina com a mesma partição e normalização de ``neat/train.py``.
+
+    Returns:
+        tuple: (modelo, scaler, X_test, y_test, linhas de treino)
+    """
+    X, y = load_features()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=RANDOM_STATE)
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    X_test = scaler.transform(X_test)
+    clf = fit_forest(X_train, y_train, n_estimators, n_jobs, **params)
+    return clf, scaler, X_test, y_test, len(y_train)
+
+def _split(X, y, offset):
+    test = (np.arange(offset, offset + len(y)) % TEST_EVERY) == 0
+    return X[~test], y[~test], X[test], y[test]
+
+def train_out_of_core(chunk_rows, trees_per_chunk=10, n_jobs=-1, **params):
+    """
+    Treina bloco a bloco com memória limitada pelo tamanho do bloco.
+
+    Uma primeira passada ajusta o scaler (``partial_fit``); na segunda, cada
+    bloco acrescenta ``trees_per_chunk`` árvores (``warm_start``); na terceira,
+    as linhas reservadas são previstas.
+
+    Blocos de treino com uma só classe (ex.: um aeroporto sem go-arounds, já
+    que os blocos do feature store não cruzam partições) são acumulados e
+    treinados junto com o bloco seguinte. Só o que passa de ``chunk_rows``
+    linhas acumuladas, ou sobra no fim, fica de fora e é contado.
+
+    Returns:
+        tuple: (modelo, scaler, y_test, y_pred, linhas de treino, linhas descartadas)
+
+    Raises:
+        ValueError: Nenhum bloco tinha as duas classes (nenhuma árvore treinada)
+    """
+    scaler = StandardScaler()
+    offset = 0
+    for X, y in iter_features(chunk_rows):
+        X_train, _, _, _ = _split(X, y, offset)
+        scaler.partial_fit(X_train)
+        offset += len(y)
 
-# === LOAD DATA ===
-df = pd.read_csv(DATA_PATH)
+    clf = RandomForestClassifier(n_estimators=0, warm_start=True, n_jobs=n_jobs,
+                                 random_state=RANDOM_STATE, **params)
+    offset = 0
+    n_train = 0
+    n_skipped = 0
+    carry_X = carry_y = None
+    for X, y in iter_features(chunk_rows):
+        X_train, y_train, _, _ = _split(X, y, offset)
+        offset += len(y)
+        if carry_y is not None:
+            X_train = np.concatenate([carry_X, X_train])
+            y_train = np.concatenate([carry_y, y_train])
+            carry_X = carry_y = None
+        if len(np.unique(y_train)) < 2:
+            # Memória limitada: guarda no máximo chunk_rows linhas (as mais recentes)
+            n_skipped += max(len(y_train) - chunk_rows, 0)
+            carry_X, carry_y = X_train[-chunk_rows:], y_train[-chunk_rows:]
+            continue
+        clf.n_estimators += trees_per_chunk
+        clf.fit(scaler.transform(X_train), y_train)
+        n_train += len(y_train)
+    if carry_y is not None:
+        n_skipped += len(carry_y)
+    if not n_train:
+        raise ValueError("Nenhuma árvore treinada: nenhum bloco de treino tem as duas classes "
+                         "(aumente --chunk-rows)")
 
-# === PREPROCESS ===
-X = df.drop(columns=["go_around"])
-y = df["has_ga"]
+    offset = 0
+    y_test, y_pred = [], []
+    for X, y in iter_features(chunk_rows):
+        _, _, X_test, y_chunk = _split(X, y, offset)
+        offset += len(y)
+        if len(y_chunk):
+            y_test.append(y_chunk)
+            y_pred.append(clf.predict(scaler.transform(X_test)))
+    return clf, scaler, np.concatenate(y_test), np.concatenate(y_pred), n_train, n_skipped
 
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Baseline Random Forest para predição de go-arounds")
+    parser.add_argument("--n-estimators", type=int, default=N_ESTIMATORS)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="processos de treino (-1 = todos os núcleos)")
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--min-samples-leaf", type=int, default=1,
+                        help="valores maiores geram árvores (e arquivos) menores")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="treino out-of-core em blocos de N linhas")
+    parser.add_argument("--trees-per-chunk", type=int, default=10)
+    parser.add_argument("--output", default=BUNDLE_PATH)
+    args = parser.parse_args()
+    params = {'max_depth': args.max_depth, 'min_samples_leaf': args.min_samples_leaf}
 
-X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.2, random_state=42)
+    # === TRAIN ===
+    start = time.perf_counter()
+    n_skipped = 0
+    if args.chunk_rows:
+        clf, scaler, y_test, y_pred, n_train, n_skipped = train_out_of_core(
+            args.chunk_rows, args.trees_per_chunk, args.n_jobs, **params)
+        train_seconds = time.perf_counter() - start
+        predict_seconds = None
+    else:
+        clf, scaler, X_test, y_test, n_train = train_in_memory(args.n_estimators, args.n_jobs, **params)
+        train_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        y_pred = clf.predict(X_test)
+        predict_seconds = time.perf_counter() - start
 
-# === RANDOM FOREST ===
-clf = RandomForestClassifier(n_estimators=100, random_state=42)
-clf.fit(X_train, y_train)
+    # === SAVE ===
+    metrics = {
+        'train_rows': n_train,
+        'skipped_rows': n_skipped,
+        'train_seconds': train_seconds,
+        'train_rows_per_sec': n_train / train_seconds,
+        'test_rows': len(y_test),
+        'accuracy': accuracy_score(y_test, y_pred),
+        'n_estimators': len(clf.estimators_)
+    }
+    ModelBundle.from_scaler(clf, 'random_forest', scaler, features=SELECTED_COLUMNS,
+                            metrics=metrics).save(args.output, compress=True)
 
-# === EVAL ===
-y_pred = clf.predict(X_test)
+    # === EVAL ===
+    print(f"Treino: {n_train:,} linhas em {train_seconds:.2f}s "
+          f"({metrics['train_rows_per_sec']:,.0f} linhas/s, {metrics['n_estimators']} árvores)")
+    if n_skipped:
+        print(f"Descartadas: {n_skipped:,} linhas de treino em blocos com uma só classe")
+    if predict_seconds is not None:
+        print(f"Predição: {len(y_test):,} linhas em {predict_seconds:.2f}s")
+    print(f"Bundle: {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
 
-print("Confusion Matrix:")
-print(confusion_matrix(y_test, y_pred))
+    print("Confusion Matrix:")
+    print(confusion_matrix(y_test, y_pred))
 
-print("\nClassification Report:")
-print(classification_report(y_test, y_pred, digits=4))
+    print("\nClassification Report:")
+    print(classification_report(y_test, y_pred, digits=4))
@@ -0,0 +1,317 @@
+"""
+Benchmarks de pré-processamento, avaliação, inferência e baseline.
+
+Gera datasets sintéticos com as colunas de SELECTED_COLUMNS (mais ``has_ga``,
+``go_around`` e ``airport``) nos tamanhos pedidos e mede:
+
+- ``feature_engineering.main`` (CSV -> X.npy/y.npy) e ``stream_features``
+- avaliação de fitness (o corpo de ``eval_genomes``) para genomas aleatórios
+  com diferentes números de nós ocultos
+- inferência em lote com ``WinnerModel``
+- fit/predict do baseline Random Forest (``rf_classifier.fit_forest``)
+
+Os resultados são gravados em JSON e comparados com um baseline salvo
+(``--save-baseline`` grava um novo); o processo termina com código 1 se algum
+benchmark ficar mais lento que a tolerância.
+
+Uso:
+    python benchmarks/run_benchmarks.py --sizes 10k,1m,10m
+    python benchmarks/run_benchmarks.py --sizes 10k --save-baseline
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(ROOT, "utils"))
+sys.path.append(os.path.join(ROOT, "neat"))
+sys.path.append(os.path.join(ROOT, "baseline"))
+
+import neat
+from neat.graphs import feed_forward_layers
+
+import feature_engineering
+from feature_engineering import SELECTED_COLUMNS, LABEL_COLUMN
+from batch_eval import score_genomes
+from inference import WinnerModel, load_config
+from rf_classifier import fit_forest, N_ESTIMATORS
+
+CONFIG_PATH = os.path.join(ROOT, "neat", "config_neat.txt")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+RESULTS_PATH = "benchmarks/results.json"
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+HIDDEN_NODES = (0, 8, 32)
+GENOMES_PER_DEPTH = 10
+RF_MAX_ROWS = 200_000
+GENERATION_CHUNK = 1_000_000
+
+# Faixas plausíveis para cada feature (mínimo, máximo)
+FEATURE_RANGES = {
+    "wind_speed_knts": (0.0, 40.0),
+    "wind_dir_deg": (0.0, 360.0),
+    "temperature_deg": (-20.0, 40.0),
+    "press_p": (980.0, 1040.0),
+    "visibility_m": (200.0, 10_000.0),
+    "rwy_length": (1_500.0, 4_000.0),
+    "glide_slope_angle": (2.5, 3.5),
+    "n_approaches": (1.0, 50.0),
+}
+AIRPORTS = ["LSZH", "LSGG", "EGLL", "EDDF", "LFPG", "KJFK", "RJTT", "SBGR"]
+
+
+def synthetic_frame(n_rows, rng, nan_fraction=0.001):
+    """
+    DataFrame sintético com o formato do CSV de go-arounds.
+
+    A probabilidade de go-around cresce com o vento e cai com a visibilidade,
+    para que os modelos tenham algum sinal a aprender.
+    """
+    data = {}
+    for column in SELECTED_COLUMNS:
+        low, high = FEATURE_RANGES[column]
+        data[column] = rng.uniform(low, high, n_rows)
+    logit = -4.0 + 0.08 * data["wind_speed_knts"] - 0.0003 * data["visibility_m"]
+    ga = rng.random(n_rows) < 1.0 / (1.0 + np.exp(-logit))
+    for column in SELECTED_COLUMNS:
+        data[column][rng.random(n_rows) < nan_fraction] = np.nan
+    frame = pd.DataFrame(data)
+    frame[LABEL_COLUMN] = np.where(ga, "true", "false")
+    frame["go_around"] = ga.astype(np.int8)
+    frame["airport"] = rng.choice(AIRPORTS, n_rows)
+    return frame
+
+
+def write_synthetic_csv(path, n_rows, seed=0):
+    """Grava o CSV sintético em blocos (memória limitada por GENERATION_CHUNK)."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for start in range(0, n_rows, GENERATION_CHUNK):
+        chunk = synthetic_frame(min(GENERATION_CHUNK, n_rows - start), rng)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def random_genome(config, key, hidden_nodes):
+    """Genoma aleatório com ``hidden_nodes`` divisões de conexões."""
+    genome = config.genome_type(key)
+    genome.configure_new(config.genome_config)
+    for _ in range(hidden_nodes):
+        genome.mutate_add_node(config.genome_config)
+        genome.mutate_add_connection(config.genome_config)
+    return genome
+
+
+def network_depth(genome, config):
+    connections = [k for k, c in genome.connections.items() if c.enabled]
+    return len(feed_forward_layers(config.genome_config.input_keys,
+                                   config.genome_config.output_keys, connections))
+
+
+def measure(fn, repeat):
+    """Executa ``fn`` ``repeat`` vezes e retorna os tempos (s)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def result(name, rows, times, params=None, items=None):
+    best = min(times)
+    return {
+        "name": name,
+        "rows": rows,
+        "params": params or {},
+        "seconds": best,
+        "times": times,
+        "rows_per_sec": (items or rows) / best if best else None
+    }
+
+
+def bench_preprocessing(n_rows, repeat):
+    results = []
+    times = measure(lambda: feature_engineering.main(use_cache=False), repeat)
+    results.append(result("feature_engineering.main", n_rows, times))
+    times = measure(lambda: feature_engineering.stream_features(), repeat)
+    results.append(result("feature_engineering.stream_features", n_rows, times))
+    return results
+
+
+def bench_models(n_rows, repeat, rf_max_rows, seed=0):
+    X = np.load(feature_engineering.X_OUTPUT_PATH).astype(np.float64)
+    y = np.load(feature_engineering.Y_OUTPUT_PATH).astype(np.int64)
+    X = (X - X.mean(axis=0)) / X.std(axis=0)
+    config = load_config(CONFIG_PATH)
+    random.seed(seed)
+    results = []
+
+    for hidden in HIDDEN_NODES:
+        genomes = [random_genome(config, i, hidden) for i in range(GENOMES_PER_DEPTH)]
+        params = {
+            "hidden_nodes": hidden,
+            "genomes": len(genomes),
+            "mean_depth": float(np.mean([network_depth(g, config) for g in genomes]))
+        }
+        times = measure(lambda: score_genomes(genomes, config, X, y), repeat)
+        results.append(result("eval_genomes", len(y), times, params, items=len(y) * len(genomes)))
+
+        model = WinnerModel(genomes[0], config)
+        times = measure(lambda: model.predict_proba(X), repeat)
+        results.append(result("winner_inference", len(y), times,
+                              {"hidden_nodes": hidden, "depth": network_depth(genomes[0], config)}))
+
+    rows = min(len(y), rf_max_rows)
+    params = {"n_estimators": N_ESTIMATORS, "fit_rows": rows, "n_jobs": -1}
+    start = time.perf_counter()
+    clf = fit_forest(X[:rows], y[:rows])
+    times = [time.perf_counter() - start]
+    results.append(result("random_forest.fit", rows, times, params))
+    times = measure(lambda: clf.predict(X), repeat)
+    results.append(result("random_forest.predict", len(y), times, params))
+    return results
+
+
+def run(sizes, repeat, rf_max_rows, seed=0):
+    """
+    Executa todos os benchmarks em um diretório temporário.
+
+    Args:
+        sizes (list): Rótulos de SIZES (ex.: ``['10k', '1m']``)
+        repeat (int): Repetições por medida (usa-se o melhor tempo); tamanhos
+            a partir de 1M linhas usam uma única repetição
+        rf_max_rows (int): Limite de linhas de treino do RandomForest
+
+    Returns:
+        list: Resultados de todos os benchmarks
+    """
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Os caminhos de feature_engineering são relativos ("data/...")
+        os.chdir(workdir)
+        try:
+            for label in sizes:
+                n_rows = SIZES[label]
+                print(f"Gerando {n_rows:,} linhas sintéticas...")
+                write_synthetic_csv(feature_engineering.INPUT_PATH, n_rows, seed)
+                size_repeat = repeat if n_rows < 1_000_000 else 1
+                for entry in bench_preprocessing(n_rows, size_repeat) + \
+                        bench_models(n_rows, size_repeat, rf_max_rows, seed):
+                    entry["size"] = label
+                    print(f"  {_label(entry):<38} {entry['seconds']:9.3f}s  "
+                          f"{entry['rows_per_sec']:,.0f} rows/s")
+                    results.append(entry)
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def _label(entry):
+    hidden = entry["params"].get("hidden_nodes")
+    return entry["name"] if hidden is None else f"{entry['name']} (hidden={hidden})"
+
+
+def _key(entry):
+    return entry["name"], entry["rows"], json.dumps(entry["params"], sort_keys=True)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compara os tempos com um baseline.
+
+    Returns:
+        list: Entradas com ``ratio`` (atual / baseline) e ``regression``
+    """
+    reference = {_key(entry): entry for entry in baseline["results"]}
+    comparison = []
+    for entry in results:
+        old = reference.get(_key(entry))
+        if old is None:
+            continue
+        ratio = entry["seconds"] / old["seconds"]
+        comparison.append({
+            "name": entry["name"],
+            "rows": entry["rows"],
+            "params": entry["params"],
+            "baseline_seconds": old["seconds"],
+            "seconds": entry["seconds"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + tolerance
+        })
+    return comparison
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "neat": getattr(neat, "__version__", None),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de throughput do pipeline de go-arounds")
+    parser.add_argument("--sizes", default="10k,1m,10m", help="tamanhos separados por vírgula (10k, 1m, 10m)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rf-max-rows", type=int, default=RF_MAX_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="lentidão relativa tolerada antes de acusar regressão")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como novo baseline")
+    args = parser.parse_args()
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"tamanhos desconhecidos: {unknown} (use {list(SIZES)})")
+
+    report = {
+        "environment": environment(),
+        "settings": {"sizes": sizes, "repeat": args.repeat, "rf_max_rows": args.rf_max_rows,
+                     "seed": args.seed},
+        "results": run(sizes, args.repeat, args.rf_max_rows, args.seed)
+    }
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report["results"], json.load(f), args.tolerance)
+        print("\nComparação com o baseline:")
+        for entry in report["comparison"]:
+            flag = "REGRESSÃO" if entry["regression"] else "ok"
+            print(f"  {_label(entry):<38} {entry['rows']:>10,} {entry['ratio']:6.2f}x  {flag}")
+        regressions = [e for e in report["comparison"] if e["regression"]]
+    elif not args.save_baseline:
+        print(f"\nBaseline {args.baseline} não encontrado; use --save-baseline para criá-lo.")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline salvo em {args.baseline}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,200 @@
+"""
+Avaliação vetorizada de redes NEAT feed-forward.
+
+Compila o fenótipo gerado por ``neat.nn.FeedForwardNetwork.create`` em
+matrizes NumPy por camada (``neat.graphs.feed_forward_layers``), permitindo
+propagar todo o conjunto de treino de uma só vez em vez de chamar
+``net.activate`` linha a linha.
+"""
+
+import numpy as np
+import neat
+from neat import activations, aggregations
+from neat.graphs import feed_forward_layers
+
+
+def _sigmoid(z):
+    z = np.clip(5.0 * z, -60.0, 60.0)
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _tanh(z):
+    z = np.clip(2.5 * z, -60.0, 60.0)
+    return np.tanh(z)
+
+
+def _relu(z):
+    return np.where(z > 0.0, z, 0.0)
+
+
+# Equivalentes NumPy das funções de ativação/agregação usadas em config_neat.txt
+ACTIVATIONS = {
+    activations.sigmoid_activation: _sigmoid,
+    activations.tanh_activation: _tanh,
+    activations.relu_activation: _relu,
+}
+
+AGGREGATIONS = {
+    aggregations.sum_aggregation: 'sum',
+    aggregations.mean_aggregation: 'mean',
+    aggregations.max_aggregation: 'max',
+}
+
+
+def _vectorize_activation(func):
+    """Fallback para ativações sem equivalente NumPy (avaliação elemento a elemento)."""
+    return np.vectorize(func, otypes=[np.float64])
+
+
+class BatchFeedForwardNetwork(object):
+    """
+    Rede feed-forward compilada em matrizes por camada.
+
+    Cada camada guarda os índices das colunas de entrada que consome, uma
+    matriz de pesos densa e, por nó, bias, response, agregação e ativação.
+    """
+
+    def __init__(self, num_inputs, output_index, layers, num_nodes):
+        self.num_inputs = num_inputs
+        self.output_index = output_index
+        self.layers = layers
+        self.num_nodes = num_nodes
+
+    @staticmethod
+    def create(genome, config):
+        """
+        Compila um genoma em uma BatchFeedForwardNetwork.
+
+        Args:
+            genome (neat.DefaultGenome): Genoma a ser compilado
+            config (neat.Config): Configuração NEAT
+
+        Returns:
+            BatchFeedForwardNetwork: Rede pronta para ``activate_batch``
+        """
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        node_evals = {node: (act, agg, bias, response, links)
+                      for node, act, agg, bias, response, links in net.node_evals}
+
+        input_keys = config.genome_config.input_keys
+        output_keys = config.genome_config.output_keys
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        layer_sets = feed_forward_layers(input_keys, output_keys, connections)
+
+        # Colunas: entradas primeiro, depois os nós na ordem de avaliação
+        index = {key: i for i, key in enumerate(input_keys)}
+        layers = []
+        for layer_set in layer_sets:
+            nodes = sorted(layer_set)
+            sources = sorted({i for node in nodes for i, _ in node_evals[node][4]},
+                             key=lambda k: index[k])
+            src_pos = {k: j for j, k in enumerate(sources)}
+            weights = np.zeros((len(sources), len(nodes)))
+            mask = np.zeros((len(sources), len(nodes)), dtype=bool)
+            bias = np.empty(len(nodes))
+            response = np.empty(len(nodes))
+            agg_groups = {}
+            act_groups = {}
+            for j, node in enumerate(nodes):
+                act, agg, b, r, links = node_evals[node]
+                for i, w in links:
+                    weights[src_pos[i], j] = w
+                    mask[src_pos[i], j] = True
+                bias[j] = b
+                response[j] = r
+                agg_groups.setdefault(AGGREGATIONS.get(agg, agg), []).append(j)
+                act_groups.setdefault(act, []).append(j)
+            for node in nodes:
+                index[node] = len(index)
+            layers.append({
+                'sources': np.array([index[k] for k in sources], dtype=np.intp),
+                'targets': np.array([index[n] for n in nodes], dtype=np.intp),
+                'weights': weights,
+                'mask': mask,
+                'bias': bias,
+                'response': response,
+                'aggregations': [(a, np.array(cols, dtype=np.intp)) for a, cols in agg_groups.items()],
+                'activations': [(ACTIVATIONS.get(a) or _vectorize_activation(a), np.array(cols, dtype=np.intp))
+                                for a, cols in act_groups.items()],
+            })
+
+        # Saídas fora de qualquer camada ficam em 0.0, como em FeedForwardNetwork
+        output_index = [index.get(k, -1) for k in output_keys]
+        return BatchFeedForwardNetwork(len(input_keys), output_index, layers, len(index))
+
+    def activate_batch(self, X):
+        """
+        Propaga um lote de amostras pela rede.
+
+        Args:
+            X (array-like): Matriz (n_amostras, num_inputs)
+
+        Returns:
+            numpy.ndarray: Matriz (n_amostras, num_outputs) com as saídas
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.num_inputs:
+            raise RuntimeError("Expected {0:n} inputs, got shape {1}".format(self.num_inputs, X.shape))
+
+        values = np.zeros((X.shape[0], self.num_nodes + 1))
+        values[:, :self.num_inputs] = X
+        for layer in self.layers:
+            inputs = values[:, layer['sources']]
+            s = np.empty((X.shape[0], len(layer['targets'])))
+            for agg, cols in layer['aggregations']:
+                w = layer['weights'][:, cols]
+                if agg == 'sum':
+                    s[:, cols] = inputs @ w
+                elif agg == 'mean':
+                    s[:, cols] = (inputs @ w) / layer['mask'][:, cols].sum(axis=0)
+                elif agg == 'max':
+                    for c, col in zip(cols, w.T):
+                        used = layer['mask'][:, c]
+                        s[:, c] = (inputs[:, used] * col[used]).max(axis=1)
+                else:
+                    for c, col in zip(cols, w.T):
+                        used = layer['mask'][:, c]
+                        products = inputs[:, used] * col[used]
+                        s[:, c] = [agg(list(row)) for row in products]
+            z = layer['bias'] + layer['response'] * s
+            for act, cols in layer['activations']:
+                values[:, layer['targets'][cols]] = act(z[:, cols])
+
+        # A coluna extra (índice -1) é sempre zero
+        return values[:, self.output_index]
+
+
+def batch_accuracy(net, X, y, threshold=0.5):
+    """
+    Acurácia de uma rede compilada sobre um conjunto inteiro.
+
+    Args:
+        net (BatchFeedForwardNetwork): Rede compilada
+        X (numpy.ndarray): Features
+        y (numpy.ndarray): Rótulos binários
+        threshold (float): Limiar de decisão sobre a primeira saída
+
+    Returns:
+        float: Fração de acertos
+    """
+    predictions = (net.activate_batch(X)[:, 0] > threshold).astype(np.int64)
+    return float(np.mean(predictions == np.asarray(y)))
+
+
+def score_genomes(genomes, config, X, y, rows=None):
+    """
+    Acurácia de cada genoma, opcionalmente restrita a um subconjunto de linhas.
+
+    Args:
+        genomes (list): Genomas a avaliar
+        config (neat.Config): Configuração NEAT
+        X (numpy.ndarray): Features
+        y (numpy.ndarray): Rótulos binários
+        rows (numpy.ndarray, optional): Índices das linhas usadas
+
+    Returns:
+        list: Fitness de cada genoma, na mesma ordem
+    """
+    if rows is not None:
+        X, y = X[rows], y[rows]
+    return [batch_accuracy(BatchFeedForwardNetwork.create(g, config), X, y) for g in genomes]
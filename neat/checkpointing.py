@@ -0,0 +1,198 @@
+"""
+Checkpoints periódicos e retomada de treinamentos NEAT.
+
+Diferente de ``neat.Checkpointer``, o estado é serializado no final da
+geração e gravado em segundo plano (compressão + escrita atômica via arquivo
+temporário e ``os.replace``). Além de população, espécies e estado do
+``random``, o checkpoint guarda o melhor genoma já visto, o contador de ids de
+genomas, reporters como o ``StatisticsReporter`` e o estado de objetos extras
+(ex.: o RNG do ``SubsampleEvaluator``), de modo que a execução retomada produz
+os mesmos resultados da execução contínua.
+"""
+
+import os
+import gzip
+import lzma
+import time
+import pickle
+import random
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import neat
+from neat.reporting import BaseReporter
+
+CHECKPOINT_DIR = "neat/checkpoints"
+COMPRESSORS = {
+    None: ('', None),
+    'gzip': ('.gz', lambda data: gzip.compress(data, compresslevel=5)),
+    'lzma': ('.xz', lzma.compress),
+}
+
+
+def _decompress(path, data):
+    if path.endswith('.gz'):
+        return gzip.decompress(data)
+    if path.endswith('.xz'):
+        return lzma.decompress(data)
+    return data
+
+
+def _write_atomic(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def population_state(population):
+    """
+    Estado serializável de uma população (sem reporters).
+
+    O ``species_set`` referencia o ReporterSet da população; a referência é
+    removida temporariamente ao serializar e religada em ``restore_population``.
+    """
+    return {
+        'generation': population.generation,
+        'config': population.config,
+        'population': population.population,
+        'species_set': population.species,
+        'best_genome': population.best_genome,
+        'random_state': random.getstate()
+    }
+
+
+def dumps_state(state):
+    """Serializa um estado de ``population_state`` sem o ReporterSet."""
+    species_set = state['species_set']
+    reporter_set, species_set.reporters = species_set.reporters, None
+    try:
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        species_set.reporters = reporter_set
+
+
+def restore_population(state):
+    """Recria a ``neat.Population`` (e o estado do ``random``) a partir de ``population_state``."""
+    random.setstate(state['random_state'])
+    p = neat.Population(state['config'], (state['population'], state['species_set'], state['generation']))
+    p.species.reporters = p.reporters
+    p.best_genome = state['best_genome']
+    # Continua a numeração dos genomas de onde a execução original parou
+    p.reproduction.genome_indexer = itertools.count(max(state['population']) + 1)
+    return p
+
+
+class AsyncCheckpointer(BaseReporter):
+    """
+    Reporter que salva checkpoints em segundo plano.
+
+    Args:
+        population (neat.Population): População sendo treinada
+        generation_interval (int, optional): Gerações entre checkpoints
+        time_interval_seconds (float, optional): Segundos entre checkpoints
+        directory (str): Diretório de saída
+        compression (str, optional): ``None``, ``'gzip'`` ou ``'lzma'``
+        reporters (dict, optional): Reporters salvos junto (ex.: ``{'stats': stats}``)
+        extra (dict, optional): Objetos com ``get_state()``/``set_state()``
+        keep_last (int, optional): Quantos checkpoints manter (None mantém todos)
+    """
+
+    def __init__(self, population, generation_interval=10, time_interval_seconds=None,
+                 directory=CHECKPOINT_DIR, compression='gzip', reporters=None, extra=None,
+                 keep_last=None):
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Compressão desconhecida: {compression!r}")
+        self.population = population
+        self.generation_interval = generation_interval
+        self.time_interval_seconds = time_interval_seconds
+        self.directory = directory
+        self.compression = compression
+        self.reporters = reporters or {}
+        self.extra = extra or {}
+        self.keep_last = keep_last
+        self.saved = []
+        self.current_generation = None
+        self.last_generation_checkpoint = population.generation - 1
+        self.last_time_checkpoint = time.time()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = []
+
+    def start_generation(self, generation):
+        self.current_generation = generation
+
+    def end_generation(self, config, population, species_set):
+        due = False
+        if self.time_interval_seconds is not None:
+            due = time.time() - self.last_time_checkpoint >= self.time_interval_seconds
+        if not due and self.generation_interval is not None:
+            due = self.current_generation - self.last_generation_checkpoint >= self.generation_interval
+        if due:
+            self.save_checkpoint(config, population, species_set)
+            self.last_generation_checkpoint = self.current_generation
+            self.last_time_checkpoint = time.time()
+
+    def save_checkpoint(self, config, population, species_set):
+        """Serializa o estado agora e agenda a compressão/escrita em segundo plano."""
+        # Population.run incrementa a geração logo após end_generation
+        generation = self.current_generation + 1
+        state = population_state(self.population)
+        state.update({
+            'generation': generation,
+            'config': config,
+            'population': population,
+            'species_set': species_set,
+            'reporters': self.reporters,
+            'extra': {name: obj.get_state() for name, obj in self.extra.items()},
+        })
+        data = dumps_state(state)
+        suffix, compress = COMPRESSORS[self.compression]
+        path = os.path.join(self.directory, f"neat-checkpoint-{generation}.pkl{suffix}")
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(self._executor.submit(self._write, path, data, compress))
+        return path
+
+    def _write(self, path, data, compress):
+        os.makedirs(self.directory, exist_ok=True)
+        _write_atomic(path, compress(data) if compress else data)
+        self.saved.append(path)
+        if self.keep_last:
+            while len(self.saved) > self.keep_last:
+                old = self.saved.pop(0)
+                if os.path.exists(old):
+                    os.remove(old)
+
+    def wait(self):
+        """Bloqueia até que todos os checkpoints agendados estejam no disco."""
+        for future in self._pending:
+            future.result()
+        self._pending = []
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown()
+
+
+def restore_checkpoint(path, extra=None):
+    """
+    Restaura uma população a partir de um checkpoint.
+
+    Args:
+        path (str): Arquivo gerado por ``AsyncCheckpointer``
+        extra (dict, optional): Objetos cujo ``set_state`` recebe o estado salvo
+
+    Returns:
+        tuple: (neat.Population, dict de reporters salvos)
+    """
+    with open(path, 'rb') as f:
+        state = pickle.loads(_decompress(path, f.read()))
+
+    p = restore_population(state)
+    for name, obj in (extra or {}).items():
+        if name in state['extra']:
+            obj.set_state(state['extra'][name])
+    for reporter in state['reporters'].values():
+        p.add_reporter(reporter)
+    return p, state['reporters']
@@ -0,0 +1,233 @@
+"""
+Reporter de estatísticas com memória limitada.
+
+Substitui ``neat.StatisticsReporter``, que guarda uma cópia do melhor genoma e
+o fitness de todos os genomas de todas as gerações. Aqui cada geração vira
+uma linha de arrays NumPy pré-alocados (contagem, média, desvio, mínimo,
+máximo e mediana do fitness), os tamanhos e o fitness médio das espécies vão
+para arrays planos (uma entrada por espécie viva) e só os ``keep_genomes``
+melhores genomas mais recentes ficam em memória, num buffer circular. Com
+``spill_path`` os genomas que saem do buffer são anexados (pickle) a um
+arquivo e continuam acessíveis por ``most_fit_genomes``.
+
+Os acessores usados pelas visualizações são os mesmos do reporter do NEAT:
+``get_fitness_mean``, ``get_fitness_stdev``, ``get_fitness_stat``,
+``get_species_sizes``, ``most_fit_genomes`` e ``best_genome``.
+"""
+
+import os
+import copy
+import pickle
+import statistics
+
+import numpy as np
+from neat.math_util import mean, stdev, median2
+from neat.reporting import BaseReporter
+
+FITNESS_COLUMNS = ('count', 'mean', 'std', 'min', 'max', 'median')
+# Funções de get_fitness_stat respondidas pelas colunas pré-calculadas
+_STAT_COLUMNS = {
+    mean: 'mean', stdev: 'std', median2: 'median', min: 'min', max: 'max', len: 'count',
+    np.mean: 'mean', np.std: 'std', np.median: 'median', np.min: 'min', np.max: 'max',
+    statistics.mean: 'mean', statistics.pstdev: 'std', statistics.median: 'median'
+}
+
+
+def _grow(array, rows):
+    """Cópia de ``array`` com pelo menos ``rows`` linhas (dobrando a capacidade)."""
+    if rows <= len(array):
+        return array
+    grown = np.empty((max(rows, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class _GenomeHistory(object):
+    """
+    Sequência dos melhores genomas por geração: buffer circular em memória e,
+    opcionalmente, os mais antigos num arquivo de spill.
+    """
+
+    def __init__(self, reporter):
+        self._reporter = reporter
+
+    def __len__(self):
+        return len(self.generations)
+
+    @property
+    def generations(self):
+        """Gerações cobertas (``range``)."""
+        r = self._reporter
+        first = 0 if r.spill_path else max(0, r.generations - len(r._ring))
+        return range(first, r.generations)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._reporter._genome_at(self.generations[index])
+
+    def __iter__(self):
+        for generation in self.generations:
+            yield self._reporter._genome_at(generation)
+
+
+class CompactStatisticsReporter(BaseReporter):
+    """
+    Estatísticas de treino em arrays NumPy, com memória limitada.
+
+    Args:
+        generations (int): Gerações pré-alocadas (os arrays dobram se faltar)
+        keep_genomes (int): Melhores genomas mantidos em memória (buffer circular)
+        spill_path (str, optional): Arquivo que recebe os genomas que saem do
+            buffer; sem ele, esses genomas são descartados (o melhor de todos
+            é sempre mantido)
+    """
+
+    def __init__(self, generations=256, keep_genomes=16, spill_path=None):
+        self.generations = 0
+        self.keep_genomes = keep_genomes
+        self.spill_path = spill_path
+        self._fitness = np.empty((max(generations, 1), len(FITNESS_COLUMNS)), dtype=np.float64)
+        # Espécies por geração em formato CSR: offsets[g]:offsets[g + 1]
+        self._species_offsets = np.zeros(max(generations, 1) + 1, dtype=np.int64)
+        self._species = np.empty((max(generations, 1) * 8, 3), dtype=np.float64)
+        self._ring = []
+        self._spill_offsets = np.empty(0, dtype=np.int64)
+        self._best = None
+        if spill_path:
+            os.makedirs(os.path.dirname(spill_path) or '.', exist_ok=True)
+            open(spill_path, 'wb').close()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        g = self.generations
+        fitness = np.fromiter((genome.fitness for genome in population.values()), dtype=np.float64,
+                              count=len(population))
+        self._fitness = _grow(self._fitness, g + 1)
+        self._fitness[g] = (len(fitness), fitness.mean(), fitness.std(), fitness.min(),
+                            fitness.max(), np.median(fitness))
+
+        start = self._species_offsets[g]
+        rows = [(sid, len(s.members), np.mean([m.fitness for m in s.members.values()]))
+                for sid, s in species.species.items()]
+        self._species = _grow(self._species, start + len(rows))
+        if rows:
+            self._species[start:start + len(rows)] = rows
+        self._species_offsets = _grow(self._species_offsets, g + 2)
+        self._species_offsets[g + 1] = start + len(rows)
+
+        genome = copy.deepcopy(best_genome)
+        if self._best is None or genome.fitness > self._best.fitness:
+            self._best = genome
+        self._ring.append(genome)
+        if len(self._ring) > self.keep_genomes:
+            self._evict(self._ring.pop(0))
+        self.generations = g + 1
+
+    def _evict(self, genome):
+        if not self.spill_path:
+            return
+        with open(self.spill_path, 'ab') as f:
+            offset = f.tell()
+            pickle.dump(genome, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spill_offsets = np.append(self._spill_offsets, offset)
+
+    def _genome_at(self, generation):
+        ring_start = self.generations - len(self._ring)
+        if generation >= ring_start:
+            return self._ring[generation - ring_start]
+        with open(self.spill_path, 'rb') as f:
+            f.seek(self._spill_offsets[generation])
+            return pickle.load(f)
+
+    @property
+    def most_fit_genomes(self):
+        """Melhor genoma de cada geração coberta (ver ``most_fit_generations``)."""
+        return _GenomeHistory(self)
+
+    @property
+    def most_fit_generations(self):
+        """Gerações de ``most_fit_genomes`` (todas com spill; senão, as mais recentes)."""
+        return _GenomeHistory(self).generations
+
+    def fitness_column(self, name):
+        """
+        Coluna de FITNESS_COLUMNS por geração.
+
+        Returns:
+            numpy.ndarray: Uma entrada por geração (visão, sem cópia)
+        """
+        return self._fitness[:self.generations, FITNESS_COLUMNS.index(name)]
+
+    def get_fitness_stat(self, f):
+        """
+        Estatística do fitness por geração.
+
+        Só funções pré-calculadas são aceitas (média, desvio, mediana, mínimo,
+        máximo e contagem), pois os valores individuais não são guardados.
+
+        Raises:
+            ValueError: ``f`` não corresponde a uma coluna pré-calculada
+        """
+        if f not in _STAT_COLUMNS:
+            raise ValueError(f"{getattr(f, '__name__', f)!r} não é pré-calculada; "
+                             f"use uma de {FITNESS_COLUMNS} (os valores individuais não são guardados)")
+        return self.fitness_column(_STAT_COLUMNS[f]).tolist()
+
+    def get_fitness_mean(self):
+        """Média do fitness por geração."""
+        return self.fitness_column('mean').tolist()
+
+    def get_fitness_stdev(self):
+        """Desvio padrão do fitness por geração."""
+        return self.fitness_column('std').tolist()
+
+    def get_fitness_median(self):
+        """Mediana do fitness por geração."""
+        return self.fitness_column('median').tolist()
+
+    def get_fitness_max(self):
+        """Fitness máximo por geração."""
+        return self.fitness_column('max').tolist()
+
+    def get_fitness_min(self):
+        """Fitness mínimo por geração."""
+        return self.fitness_column('min').tolist()
+
+    def _species_matrix(self, column, fill):
+        rows = self._species[:self._species_offsets[self.generations]]
+        if not len(rows):
+            return [[] for _ in range(self.generations)]
+        matrix = np.full((self.generations, int(rows[:, 0].max())), fill, dtype=object)
+        generation = np.repeat(np.arange(self.generations), np.diff(self._species_offsets[:self.generations + 1]))
+        matrix[generation, rows[:, 0].astype(int) - 1] = rows[:, column]
+        return matrix.tolist()
+
+    def get_species_sizes(self):
+        """Tamanho de cada espécie (ids 1..máximo) por geração; 0 se ausente."""
+        sizes = self._species_matrix(1, 0)
+        return [[int(size) for size in row] for row in sizes]
+
+    def get_species_fitness(self, null_value=''):
+        """Fitness médio de cada espécie (ids 1..máximo) por geração."""
+        return self._species_matrix(2, null_value)
+
+    def best_genome(self):
+        """Melhor genoma já visto."""
+        return self._best
+
+    def best_genomes(self, n):
+        """Os n melhores entre o melhor de todos e os genomas em memória."""
+        candidates = {id(g): g for g in self._ring + [self._best]}
+        return sorted(candidates.values(), key=lambda g: g.fitness, reverse=True)[:n]
+
+    def __getstate__(self):
+        # Checkpoints guardam só as linhas usadas
+        state = self.__dict__.copy()
+        state['_fitness'] = self._fitness[:self.generations].copy()
+        state['_species_offsets'] = self._species_offsets[:self.generations + 1].copy()
+        state['_species'] = self._species[:self._species_offsets[self.generations]].copy()
+        return state
@@ -0,0 +1,136 @@
+"""
+Memoização de fitness para genomas estruturalmente idênticos.
+
+Com elitismo e taxas de mutação baixas, muitos genomas reaparecem sem
+alterações entre gerações. O cache indexa o fitness por um hash canônico dos
+nós, das conexões habilitadas e de seus atributos, com despejo LRU limitado.
+O hash dos dados de treino faz parte do estado do cache: trocar os dados
+invalida todas as entradas.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+from neat.reporting import BaseReporter
+
+from batch_eval import score_genomes
+
+DEFAULT_MAXSIZE = 10_000
+
+
+def genome_fingerprint(genome):
+    """
+    Hash canônico do fenótipo de um genoma (independente de ``genome.key``).
+
+    Args:
+        genome (neat.DefaultGenome): Genoma
+
+    Returns:
+        bytes: Digest de 16 bytes
+    """
+    nodes = tuple(
+        (k, tuple(getattr(n, a.name) for a in n._gene_attributes))
+        for k, n in sorted(genome.nodes.items())
+    )
+    connections = tuple(
+        (k, c.weight)
+        for k, c in sorted(genome.connections.items()) if c.enabled
+    )
+    return hashlib.blake2b(repr((nodes, connections)).encode(), digest_size=16).digest()
+
+
+def data_fingerprint(X, y):
+    """Hash do conteúdo dos dados de treino."""
+    h = hashlib.blake2b(digest_size=16)
+    for array in (X, y):
+        array = np.ascontiguousarray(array)
+        h.update(repr((array.shape, array.dtype.str)).encode())
+        h.update(memoryview(array).cast('B'))
+    return h.digest()
+
+
+class FitnessCache(BaseReporter):
+    """
+    Cache LRU de fitness, usável como função de avaliação e como reporter.
+
+    Apenas avaliações no conjunto completo (``rows=None``) são memoizadas;
+    avaliações em amostras passam direto para a função de score.
+
+    Args:
+        X (numpy.ndarray): Features de treino
+        y (numpy.ndarray): Rótulos de treino
+        score (callable, optional): ``score(genomes, config, rows)`` usado nas
+            falhas do cache (por padrão ``batch_eval.score_genomes`` em série)
+        maxsize (int): Número máximo de entradas
+    """
+
+    def __init__(self, X, y, score=None, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._score = score
+        self.set_data(X, y)
+
+    def set_data(self, X, y):
+        """Atualiza os dados de treino, invalidando o cache se o conteúdo mudou."""
+        fingerprint = data_fingerprint(X, y)
+        if getattr(self, 'data_key', None) != fingerprint:
+            self.invalidate()
+        self.X = X
+        self.y = y
+        self.data_key = fingerprint
+
+    def invalidate(self):
+        self.entries.clear()
+
+    def _base_score(self, genomes, config, rows):
+        if self._score is not None:
+            return self._score(genomes, config, rows)
+        return score_genomes(genomes, config, self.X, self.y, rows)
+
+    def score(self, genomes, config, rows=None):
+        if rows is not None:
+            return self._base_score(genomes, config, rows)
+
+        keys = [genome_fingerprint(g) for g in genomes]
+        fitnesses = [None] * len(genomes)
+        missing = {}
+        for i, key in enumerate(keys):
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                fitnesses[i] = self.entries[key]
+                self.hits += 1
+            elif key in missing:
+                missing[key].append(i)
+                self.hits += 1
+            else:
+                missing[key] = [i]
+                self.misses += 1
+
+        if missing:
+            first = [positions[0] for positions in missing.values()]
+            computed = self._base_score([genomes[i] for i in first], config, None)
+            for (key, positions), fitness in zip(missing.items(), computed):
+                for i in positions:
+                    fitnesses[i] = fitness
+                self.entries[key] = fitness
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return fitnesses
+
+    def evaluate(self, genomes, config):
+        """Função de fitness compatível com ``neat.Population.run``."""
+        genomes = [g for _, g in genomes]
+        for genome, fitness in zip(genomes, self.score(genomes, config)):
+            genome.fitness = fitness
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return "Fitness cache: {0} hits, {1} misses ({2:.1%}), {3} entries".format(
+            self.hits, self.misses, rate, len(self.entries))
+
+    def end_generation(self, config, population, species_set):
+        print(self.summary())
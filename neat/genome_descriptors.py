@@ -0,0 +1,110 @@
+"""
+Descritores compactos de todos os genomas avaliados durante o treinamento.
+
+``DescriptorReporter`` grava, a cada geração, uma linha float32 por genoma
+(geração, chave, espécie, fitness e estatísticas de topologia, pesos e vieses)
+em um buffer NumPy que cresce por duplicação. Uma execução longa gera
+centenas de milhares de linhas em poucos MB; o buffer alimenta
+``visualizations.plot_genotype_embedding`` e pode ser salvo em ``.npy``.
+"""
+
+import numpy as np
+import pandas as pd
+from neat.reporting import BaseReporter
+
+DESCRIPTOR_FIELDS = (
+    'generation', 'key', 'species', 'fitness',
+    'nodes', 'connections', 'disabled',
+    'weight_mean', 'weight_std', 'weight_abs_mean', 'weight_min', 'weight_max',
+    'bias_mean', 'bias_std', 'response_mean'
+)
+# Colunas de identificação/rótulo, fora do embedding
+META_FIELDS = ('generation', 'key', 'species', 'fitness')
+FEATURE_FIELDS = tuple(f for f in DESCRIPTOR_FIELDS if f not in META_FIELDS)
+FIELD_INDEX = {name: i for i, name in enumerate(DESCRIPTOR_FIELDS)}
+
+
+def genome_descriptor(genome, generation=-1, species=-1):
+    """
+    Descritor de um genoma na ordem de DESCRIPTOR_FIELDS.
+
+    Returns:
+        numpy.ndarray: Vetor float32
+    """
+    weights = np.array([c.weight for c in genome.connections.values() if c.enabled], dtype=np.float64)
+    nodes = genome.nodes.values()
+    biases = np.array([n.bias for n in nodes], dtype=np.float64)
+    responses = np.array([n.response for n in nodes], dtype=np.float64)
+    has_w, has_n = len(weights) > 0, len(biases) > 0
+    return np.array([
+        generation, genome.key, species,
+        np.nan if genome.fitness is None else genome.fitness,
+        len(genome.nodes), len(weights), len(genome.connections) - len(weights),
+        weights.mean() if has_w else 0.0,
+        weights.std() if has_w else 0.0,
+        np.abs(weights).mean() if has_w else 0.0,
+        weights.min() if has_w else 0.0,
+        weights.max() if has_w else 0.0,
+        biases.mean() if has_n else 0.0,
+        biases.std() if has_n else 0.0,
+        responses.mean() if has_n else 0.0
+    ], dtype=np.float32)
+
+
+class DescriptorReporter(BaseReporter):
+    """
+    Reporter que acumula o descritor de cada genoma avaliado.
+
+    Args:
+        capacity (int): Linhas pré-alocadas (o buffer dobra quando enche)
+    """
+
+    def __init__(self, capacity=4096):
+        self._buffer = np.empty((capacity, len(DESCRIPTOR_FIELDS)), dtype=np.float32)
+        self._size = 0
+        self.generation = 0
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, rows):
+        needed = self._size + rows
+        if needed > len(self._buffer):
+            grown = np.empty((max(needed, 2 * len(self._buffer)), self._buffer.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._buffer[:self._size]
+            self._buffer = grown
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        species_of = species.genome_to_species
+        self._reserve(len(population))
+        for key, genome in population.items():
+            self._buffer[self._size] = genome_descriptor(genome, self.generation, species_of.get(key, -1))
+            self._size += 1
+
+    @property
+    def descriptors(self):
+        """Linhas gravadas (visão do buffer, sem cópia)."""
+        return self._buffer[:self._size]
+
+    def column(self, name):
+        return self.descriptors[:, FIELD_INDEX[name]]
+
+    def to_frame(self):
+        """
+        Returns:
+            pandas.DataFrame: Linhas gravadas com as colunas de DESCRIPTOR_FIELDS
+        """
+        return pd.DataFrame(self.descriptors, columns=list(DESCRIPTOR_FIELDS))
+
+    def save(self, path):
+        """Salva as linhas gravadas em ``.npy`` (colunas em DESCRIPTOR_FIELDS)."""
+        np.save(path, self.descriptors)
+
+    def __getstate__(self):
+        # Checkpoints guardam só as linhas usadas
+        state = self.__dict__.copy()
+        state['_buffer'] = self.descriptors.copy()
+        return state
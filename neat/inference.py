@@ -0,0 +1,95 @@
+"""
+Inferência em lote com o genoma vencedor (``neat/winner.pkl``).
+
+O genoma é carregado e compilado uma única vez em uma
+``BatchFeedForwardNetwork`` (matrizes por camada com a ordem de avaliação já
+resolvida); ``predict_proba``/``predict`` operam sobre lotes NumPy inteiros.
+"""
+
+import os
+import pickle
+import tempfile
+import numpy as np
+import neat
+
+from batch_eval import BatchFeedForwardNetwork
+
+WINNER_PATH = "neat/winner.pkl"
+CONFIG_PATH = "neat/config_neat.txt"
+BUNDLE_PATH = "neat/model_bundle.npz"
+BATCH_SIZE = 65_536
+
+
+def load_config(config_path=CONFIG_PATH):
+    return neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        config_path
+    )
+
+
+def config_from_text(text):
+    """Cria um ``neat.Config`` a partir do conteúdo de um arquivo de configuração."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(text)
+    try:
+        return load_config(f.name)
+    finally:
+        os.remove(f.name)
+
+
+class WinnerModel(object):
+    """
+    Modelo de inferência compilado a partir de um genoma NEAT.
+
+    Args:
+        genome (neat.DefaultGenome): Genoma vencedor
+        config (neat.Config): Configuração NEAT usada no treino
+        batch_size (int): Linhas propagadas por vez (limita a memória
+            intermediária em lotes muito grandes)
+    """
+
+    def __init__(self, genome, config, batch_size=BATCH_SIZE):
+        self.genome = genome
+        self.config = config
+        self.batch_size = batch_size
+        self.net = BatchFeedForwardNetwork.create(genome, config)
+
+    @classmethod
+    def load(cls, winner_path=WINNER_PATH, config_path=CONFIG_PATH, **kwargs):
+        """Carrega e compila o genoma salvo por ``train.py``."""
+        with open(winner_path, "rb") as f:
+            genome = pickle.load(f)
+        return cls(genome, load_config(config_path), **kwargs)
+
+    @classmethod
+    def from_bundle(cls, bundle, **kwargs):
+        """Compila o genoma de um ``ModelBundle`` NEAT (config embutida no bundle)."""
+        if bundle.model_type != 'neat':
+            raise ValueError(f"Bundle do tipo {bundle.model_type!r}, esperado 'neat'")
+        return cls(bundle.model, config_from_text(bundle.metadata['neat_config']), **kwargs)
+
+    def predict_proba(self, X):
+        """
+        Saída da rede para cada amostra.
+
+        Args:
+            X (array-like): Matriz (n_amostras, num_inputs) já normalizada
+
+        Returns:
+            numpy.ndarray: Vetor (n_amostras,) com o score de go-around
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if len(X) <= self.batch_size:
+            return self.net.activate_batch(X)[:, 0]
+        out = np.empty(len(X))
+        for start in range(0, len(X), self.batch_size):
+            stop = start + self.batch_size
+            out[start:stop] = self.net.activate_batch(X[start:stop])[:, 0]
+        return out
+
+    def predict(self, X, threshold=0.5):
+        """Classe prevista (1 = go-around) com o mesmo limiar do treino."""
+        return (self.predict_proba(X) > threshold).astype(np.int64)
@@ -0,0 +1,259 @@
+"""
+Modelo de ilhas para NEAT distribuído.
+
+K populações independentes evoluem em processos separados e, a cada M
+gerações, os melhores genomas de cada ilha migram para a ilha seguinte
+(topologia em anel). A migração é síncrona por época, o que torna a execução
+reprodutível dada a semente.
+
+Em uma única máquina as ilhas usam ``multiprocessing`` com os dados de treino
+em memória compartilhada. Entre nós, o coordenador publica as filas via TCP
+(``multiprocessing.managers``) e cada nó remoto executa
+``python neat/islands.py --connect host:porta --island i``.
+"""
+
+import copy
+import random
+import argparse
+import queue
+import threading
+import multiprocessing as mp
+from multiprocessing.managers import BaseManager
+
+import neat
+from neat.reporting import BaseReporter
+
+from batch_eval import score_genomes
+from parallel_eval import _share_array, _attach_array
+from compact_stats import CompactStatisticsReporter
+
+AUTHKEY = b"nos-islands"
+
+
+class _Elites(BaseReporter):
+    """Guarda cópias dos melhores genomas da última geração avaliada."""
+
+    def __init__(self, n):
+        self.n = n
+        self.genomes = []
+
+    def post_evaluate(self, config, population, species, best_genome):
+        ranked = sorted(population.values(), key=lambda g: g.fitness, reverse=True)
+        self.genomes = [copy.deepcopy(g) for g in ranked[:self.n]]
+
+
+def run_island(island_id, config, X, y, generations, migration_interval, n_migrants, inbox, outbox, seed):
+    """
+    Evolui uma ilha, trocando migrantes com o coordenador a cada época.
+
+    Mensagens enviadas em ``outbox``:
+        ``('epoch', island_id, migrantes, terminou)`` ao fim de cada época e
+        ``('done', island_id, melhor_genoma, stats)`` ao encerrar.
+    Em ``inbox`` a ilha recebe a lista de migrantes ou ``None`` (parar).
+    """
+    random.seed(seed)
+    p = neat.Population(config)
+    stats = CompactStatisticsReporter(generations)
+    elites = _Elites(n_migrants)
+    p.add_reporter(stats)
+    p.add_reporter(elites)
+
+    def fitness(genomes, config):
+        genomes = [g for _, g in genomes]
+        for genome, f in zip(genomes, score_genomes(genomes, config, X, y)):
+            genome.fitness = f
+
+    while p.generation < generations:
+        p.run(fitness, min(migration_interval, generations - p.generation))
+        done = (p.best_genome.fitness >= config.fitness_threshold) or p.generation >= generations
+        outbox.put(('epoch', island_id, elites.genomes, done))
+        migrants = inbox.get()
+        if migrants is None:
+            break
+        # Os migrantes substituem os filhos mais recentes da próxima geração
+        for key in sorted(p.population, reverse=True)[:len(migrants)]:
+            del p.population[key]
+        for genome in migrants:
+            genome = copy.deepcopy(genome)
+            genome.key = next(p.reproduction.genome_indexer)
+            genome.fitness = None
+            p.population[genome.key] = genome
+        p.species.speciate(config, p.population, p.generation)
+
+    outbox.put(('done', island_id, p.best_genome, stats))
+
+
+def _island_process(island_id, config, x_spec, y_spec, generations, migration_interval,
+                    n_migrants, inbox, outbox, seed):
+    x_shm, X = _attach_array(x_spec)
+    y_shm, y = _attach_array(y_spec)
+    try:
+        run_island(island_id, config, X, y, generations, migration_interval, n_migrants,
+                   inbox, outbox, seed)
+    finally:
+        del X, y
+        x_shm.close()
+        y_shm.close()
+
+
+class QueueManager(BaseManager):
+    pass
+
+
+class IslandModel(object):
+    """
+    Coordenador do modelo de ilhas.
+
+    Args:
+        config (neat.Config): Configuração NEAT (a mesma em todas as ilhas)
+        X (numpy.ndarray): Features de treino
+        y (numpy.ndarray): Rótulos de treino
+        islands (int): Número de ilhas (K)
+        migration_interval (int): Gerações entre migrações (M)
+        migrants (int): Genomas enviados por ilha a cada migração
+        seed (int): Semente base (a ilha i usa ``seed + i``)
+        address (tuple, optional): ``(host, porta)`` para publicar as filas via
+            TCP; ilhas fora de ``local_islands`` devem se conectar de outros nós
+        local_islands (iterable, optional): Ilhas executadas nesta máquina
+            (por padrão todas)
+    """
+
+    def __init__(self, config, X, y, islands=4, migration_interval=5, migrants=2, seed=0,
+                 address=None, local_islands=None):
+        self.config = config
+        self.X = X
+        self.y = y
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.seed = seed
+        self.address = address
+        self.local_islands = list(range(islands)) if local_islands is None else list(local_islands)
+
+    def _queues(self):
+        inboxes = [mp.Queue() for _ in range(self.islands)]
+        outbox = mp.Queue()
+        if self.address is None:
+            return inboxes, outbox, None
+        # O servidor roda numa thread deste processo: as funções registradas
+        # não precisam ser serializadas (manager.start() falha com spawn) e as
+        # ilhas locais usam as filas diretamente
+        QueueManager.register('inbox', callable=lambda i: inboxes[i])
+        QueueManager.register('outbox', callable=lambda: outbox)
+        QueueManager.register('settings', callable=self._settings)
+        server = QueueManager(address=self.address, authkey=AUTHKEY).get_server()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return inboxes, outbox, server
+
+    def _settings(self):
+        return {
+            'migration_interval': self.migration_interval,
+            'migrants': self.migrants,
+            'seed': self.seed
+        }
+
+    @staticmethod
+    def _receive(outbox, processes):
+        # Falha em vez de bloquear para sempre se uma ilha local morrer
+        while True:
+            try:
+                return outbox.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p for p in processes if p.exitcode not in (None, 0)]
+                if dead:
+                    raise RuntimeError(f"Ilha encerrada com código {dead[0].exitcode}")
+
+    def run(self, generations):
+        """
+        Executa todas as ilhas por até ``generations`` gerações.
+
+        Returns:
+            tuple: (melhor genoma entre as ilhas, lista de CompactStatisticsReporter
+            por ilha, na ordem das ilhas)
+        """
+        inboxes, outbox, server = self._queues()
+        x_shm, x_spec = _share_array(self.X)
+        y_shm, y_spec = _share_array(self.y)
+        processes = [
+            mp.Process(target=_island_process, args=(
+                i, self.config, x_spec, y_spec, generations, self.migration_interval,
+                self.migrants, inboxes[i], outbox, self.seed + i))
+            for i in self.local_islands
+        ]
+        for process in processes:
+            process.start()
+
+        results = {}
+        try:
+            active = set(range(self.islands))
+            while active:
+                epoch = {}
+                while len(epoch) < len(active):
+                    message = self._receive(outbox, processes)
+                    if message[0] == 'done':
+                        results[message[1]] = message[2:]
+                        active.discard(message[1])
+                        continue
+                    _, island_id, elites, done = message
+                    epoch[island_id] = (elites, done)
+                stop = any(done for _, done in epoch.values())
+                ring = sorted(epoch)
+                for pos, island_id in enumerate(ring):
+                    source = ring[pos - 1]
+                    inboxes[island_id].put(None if stop else epoch[source][0])
+                if stop:
+                    while len(results) < self.islands:
+                        message = self._receive(outbox, processes)
+                        if message[0] == 'done':
+                            results[message[1]] = message[2:]
+                    active.clear()
+            for process in processes:
+                process.join()
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for shm in (x_shm, y_shm):
+                shm.close()
+                shm.unlink()
+            if server is not None:
+                server.stop_event.set()
+                server.listener.close()
+
+        stats = [results[i][1] for i in range(self.islands)]
+        winner = max((results[i][0] for i in range(self.islands)), key=lambda g: g.fitness)
+        return winner, stats
+
+
+def connect_island(address, island_id, config, X, y, generations):
+    """Executa uma ilha em um nó remoto, usando as filas publicadas pelo coordenador."""
+    QueueManager.register('inbox')
+    QueueManager.register('outbox')
+    QueueManager.register('settings')
+    manager = QueueManager(address=address, authkey=AUTHKEY)
+    manager.connect()
+    settings = manager.settings()._getvalue()
+    run_island(island_id, config, X, y, generations, settings['migration_interval'],
+               settings['migrants'], manager.inbox(island_id), manager.outbox(),
+               settings['seed'] + island_id)
+
+
+if __name__ == "__main__":
+    from train import CONFIG_PATH, GENERATIONS, load_training_data
+
+    parser = argparse.ArgumentParser(description="Executa uma ilha remota do modelo de ilhas NEAT")
+    parser.add_argument("--connect", required=True, help="host:porta do coordenador")
+    parser.add_argument("--island", type=int, required=True)
+    parser.add_argument("--generations", type=int, default=GENERATIONS)
+    args = parser.parse_args()
+
+    host, port = args.connect.rsplit(":", 1)
+    X_train, _, y_train, _, _ = load_training_data()
+    config = neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        CONFIG_PATH
+    )
+    connect_island((host, int(port)), args.island, config, X_train, y_train, args.generations)
@@ -0,0 +1,109 @@
+"""
+Avaliação paralela da população NEAT.
+
+Os dados de treino são copiados uma única vez para memória compartilhada
+(``multiprocessing.shared_memory``); cada worker do pool se conecta a esses
+blocos no inicializador e recebe apenas os genomas em cada tarefa, sem
+re-serializar ``X_train``/``y_train``.
+"""
+
+import os
+import numpy as np
+from multiprocessing import Pool, shared_memory
+
+from batch_eval import score_genomes
+
+# Estado de cada processo worker, preenchido por _init_worker
+_worker = {}
+
+
+def _share_array(array):
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_array(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _init_worker(x_spec, y_spec, config):
+    x_shm, X = _attach_array(x_spec)
+    y_shm, y = _attach_array(y_spec)
+    # Mantém referências aos blocos para que os buffers continuem válidos
+    _worker.update(shm=(x_shm, y_shm), X=X, y=y, config=config)
+
+
+def _eval_chunk(task):
+    genomes, rows = task
+    return score_genomes(genomes, _worker['config'], _worker['X'], _worker['y'], rows)
+
+
+class SharedMemoryEvaluator(object):
+    """
+    Distribui a avaliação dos genomas em um pool de processos.
+
+    Produz exatamente os mesmos valores de fitness do modo serial, pois cada
+    worker executa o mesmo ``batch_accuracy`` sobre os mesmos dados.
+
+    Args:
+        num_workers (int): Número de processos (None usa ``os.cpu_count()``)
+        X (numpy.ndarray): Features de treino
+        y (numpy.ndarray): Rótulos de treino
+        config (neat.Config): Configuração NEAT
+        chunksize (int): Genomas por tarefa (None calcula automaticamente)
+    """
+
+    def __init__(self, num_workers, X, y, config, chunksize=None):
+        self.num_workers = num_workers or os.cpu_count()
+        self.chunksize = chunksize
+        self._x_shm, x_spec = _share_array(X)
+        self._y_shm, y_spec = _share_array(y)
+        self.pool = Pool(self.num_workers, initializer=_init_worker,
+                         initargs=(x_spec, y_spec, config))
+
+    def score(self, genomes, config, rows=None):
+        """
+        Calcula o fitness de uma lista de genomas no pool.
+
+        Args:
+            genomes (list): Genomas a avaliar
+            config (neat.Config): Configuração NEAT (a do inicializador é usada)
+            rows (numpy.ndarray, optional): Índices das linhas de treino usadas,
+                enviados uma vez por tarefa
+
+        Returns:
+            list: Fitness de cada genoma, na mesma ordem
+        """
+        chunksize = self.chunksize or max(1, len(genomes) // (self.num_workers * 4))
+        tasks = [(genomes[i:i + chunksize], rows) for i in range(0, len(genomes), chunksize)]
+        return [f for chunk in self.pool.map(_eval_chunk, tasks) for f in chunk]
+
+    def evaluate(self, genomes, config):
+        """Função de fitness compatível com ``neat.Population.run``."""
+        genomes = list(genomes)
+        fitnesses = self.score([g for _, g in genomes], config)
+        for (_, genome), fitness in zip(genomes, fitnesses):
+            genome.fitness = fitness
+
+    def close(self):
+        """Encerra o pool e libera a memória compartilhada."""
+        if self.pool is None:
+            return
+        self.pool.close()
+        self.pool.join()
+        self.pool = None
+        for shm in (self._x_shm, self._y_shm):
+            shm.close()
+            shm.unlink()
+        self._x_shm = self._y_shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,199 @@
+"""
+Instrumentação do loop de treinamento NEAT.
+
+``ProfilingReporter`` registra, por geração, o tempo total e o de cada fase
+(avaliação, criação das redes, ativação, reprodução, especiação e o restante,
+que inclui os reporters), genomas/s, linhas/s, a distribuição do tamanho das
+redes e o pico de memória (RSS). As fases são acumuladas por ``phase(nome)``;
+``ProfilingReporter.attach`` cronometra a reprodução e a especiação de uma
+``neat.Population`` existente.
+
+``StackSampler`` é um profiler por amostragem (sem dependências) que grava as
+pilhas da thread principal no formato "collapsed" usado por flamegraphs.
+"""
+
+import sys
+import time
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+from neat.reporting import BaseReporter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_phase_times = defaultdict(float)
+
+
+@contextmanager
+def phase(name):
+    """Acumula o tempo do bloco na fase ``name`` da geração corrente."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phase_times[name] += time.perf_counter() - start
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo, em MB (None se indisponível)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class _TimedMethod(object):
+    # Classe (e não closure) para continuar serializável nos checkpoints
+    def __init__(self, name, method):
+        self.name = name
+        self.method = method
+
+    def __call__(self, *args, **kwargs):
+        with phase(self.name):
+            return self.method(*args, **kwargs)
+
+
+def _size_stats(values, prefix):
+    values = np.asarray(values)
+    return {
+        f'{prefix}_min': int(values.min()),
+        f'{prefix}_mean': float(values.mean()),
+        f'{prefix}_max': int(values.max())
+    }
+
+
+class ProfilingReporter(BaseReporter):
+    """
+    Métricas de desempenho por geração.
+
+    Args:
+        rows (int or callable): Linhas avaliadas por genoma, ou
+            ``rows(n_genomes)`` retornando o total de linhas avaliadas na geração
+        verbose (bool): Imprime um resumo ao fim de cada geração
+    """
+
+    PHASES = ('evaluation', 'network_creation', 'activation', 'reproduction', 'speciation')
+
+    def __init__(self, rows, verbose=True):
+        self.rows = rows
+        self.verbose = verbose
+        self.records = []
+        self._record = None
+        self._start = None
+
+    @staticmethod
+    def attach(population):
+        """Cronometra a reprodução e a especiação de ``population``."""
+        for obj, method, name in ((population.reproduction, 'reproduce', 'reproduction'),
+                                  (population.species, 'speciate', 'speciation')):
+            if not isinstance(getattr(obj, method), _TimedMethod):
+                setattr(obj, method, _TimedMethod(name, getattr(obj, method)))
+
+    def timed(self, fitness_function):
+        """Envolve a função de fitness para cronometrar a fase de avaliação."""
+        def evaluate(genomes, config):
+            with phase('evaluation'):
+                return fitness_function(genomes, config)
+        return evaluate
+
+    def start_generation(self, generation):
+        _phase_times.clear()
+        self._start = time.perf_counter()
+        self._record = {'generation': generation}
+
+    def post_evaluate(self, config, population, species, best_genome):
+        genomes = list(population.values())
+        rows = self.rows(len(genomes)) if callable(self.rows) else self.rows * len(genomes)
+        evaluation = _phase_times['evaluation'] or (time.perf_counter() - self._start)
+        self._record.update({
+            'genomes': len(genomes),
+            'rows_evaluated': int(rows),
+            'genomes_per_sec': len(genomes) / evaluation if evaluation else 0.0,
+            'rows_per_sec': rows / evaluation if evaluation else 0.0
+        })
+        self._record.update(_size_stats([len(g.nodes) for g in genomes], 'nodes'))
+        self._record.update(_size_stats(
+            [sum(1 for c in g.connections.values() if c.enabled) for g in genomes], 'connections'))
+
+    def _finish(self):
+        if self._record is None:
+            return
+        wall = time.perf_counter() - self._start
+        record = self._record
+        record['wall_time'] = wall
+        for name in self.PHASES:
+            record[f'{name}_time'] = _phase_times[name]
+        record['other_time'] = max(0.0, wall - sum(
+            _phase_times[name] for name in ('evaluation', 'reproduction', 'speciation')))
+        record['peak_rss_mb'] = peak_rss_mb()
+        self.records.append(record)
+        self._record = None
+        if self.verbose:
+            print("Profile: {wall_time:.3f}s (eval {evaluation_time:.3f}s, reproduction "
+                  "{reproduction_time:.3f}s, speciation {speciation_time:.3f}s), "
+                  "{genomes_per_sec:.1f} genomes/s, {rows_per_sec:.3g} rows/s".format(**record))
+
+    def end_generation(self, config, population, species_set):
+        self._finish()
+
+    def found_solution(self, config, generation, best):
+        # Population.run sai do loop antes de reproduce/end_generation
+        self._finish()
+
+
+class StackSampler(object):
+    """
+    Profiler por amostragem da thread que o cria.
+
+    Args:
+        interval (float): Segundos entre amostras
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def dump(self, path):
+        """Grava as pilhas no formato "collapsed" (``pilha contagem`` por linha)."""
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
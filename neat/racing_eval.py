@@ -0,0 +1,138 @@
+"""
+Avaliação com corrida (racing): interrompe genomas sem chance de sobreviver.
+
+Os genomas são avaliados em blocos de linhas de ``X_train`` (mesma ordem
+aleatória para todos na geração). Após cada bloco, um intervalo de Hoeffding
+limita a acurácia final de cada genoma; dentro de cada espécie, um genoma é
+eliminado quando seu limite superior fica abaixo do limite inferior do k-ésimo
+melhor membro, onde k é o número de sobreviventes implicado por
+``survival_threshold`` (e ``elitism``) em ``DefaultReproduction``. Genomas
+eliminados recebem a acurácia nas linhas já vistas, que é menor que o corte.
+"""
+
+import math
+
+import numpy as np
+from neat.reporting import BaseReporter
+
+from batch_eval import BatchFeedForwardNetwork
+
+DEFAULT_BLOCK_SIZE = 5_000
+
+
+class RacingEvaluator(BaseReporter):
+    """
+    Função de fitness com eliminação antecipada, usável também como reporter.
+
+    Como reporter, guarda as espécies formadas em ``end_generation`` para
+    aplicar o corte por espécie na geração seguinte (sem espécies, o corte é
+    aplicado sobre a população inteira).
+
+    Args:
+        X (numpy.ndarray): Features de treino
+        y (numpy.ndarray): Rótulos de treino
+        block_size (int): Linhas avaliadas entre testes de eliminação
+        confidence (float): Confiança de cada intervalo de Hoeffding
+        seed (int, optional): Semente da ordem das linhas
+        species_set (neat.DefaultSpeciesSet, optional): Espécies da primeira
+            geração (ex.: ``p.species``)
+    """
+
+    def __init__(self, X, y, block_size=DEFAULT_BLOCK_SIZE, confidence=0.99, seed=None,
+                 species_set=None):
+        self.X = X
+        self.y = y
+        self.block_size = block_size
+        self.confidence = confidence
+        self.rng = np.random.default_rng(seed)
+        self.species_set = species_set
+        self.eliminated = 0
+        self.skipped_rows = 0
+        self.total_rows = 0
+        self.history = []
+
+    def get_state(self):
+        """Estado necessário para retomar a ordem das linhas a partir de um checkpoint."""
+        return {
+            'rng': self.rng.bit_generator.state,
+            'eliminated': self.eliminated,
+            'skipped_rows': self.skipped_rows,
+            'total_rows': self.total_rows,
+            'history': list(self.history)
+        }
+
+    def set_state(self, state):
+        self.rng.bit_generator.state = state['rng']
+        self.eliminated = state['eliminated']
+        self.skipped_rows = state['skipped_rows']
+        self.total_rows = state['total_rows']
+        self.history = list(state['history'])
+
+    def _groups(self, genomes):
+        if self.species_set is None:
+            return [np.arange(len(genomes))]
+        species_of = self.species_set.genome_to_species
+        groups = {}
+        for i, genome in enumerate(genomes):
+            groups.setdefault(species_of.get(genome.key), []).append(i)
+        return [np.array(members) for members in groups.values()]
+
+    @staticmethod
+    def _survivors(config, size):
+        # Mesmo corte de DefaultReproduction.reproduce (mínimo de 2 pais),
+        # mais os elites copiados sem alteração
+        repro = config.reproduction_config
+        return max(int(math.ceil(repro.survival_threshold * size)), 2, repro.elitism)
+
+    def evaluate(self, genomes, config):
+        """Função de fitness compatível com ``neat.Population.run``."""
+        genomes = [g for _, g in genomes]
+        nets = [BatchFeedForwardNetwork.create(g, config) for g in genomes]
+        groups = self._groups(genomes)
+        n = len(self.y)
+        order = self.rng.permutation(n)
+        log_term = math.log(1.0 / (1.0 - self.confidence))
+
+        correct = np.zeros(len(genomes))
+        seen = np.zeros(len(genomes), dtype=np.int64)
+        active = np.ones(len(genomes), dtype=bool)
+        for start in range(0, n, self.block_size):
+            rows = np.sort(order[start:start + self.block_size])
+            X, y = self.X[rows], self.y[rows]
+            for i in np.flatnonzero(active):
+                predictions = nets[i].activate_batch(X)[:, 0] > 0.5
+                correct[i] += np.count_nonzero(predictions == y)
+            seen[active] += len(rows)
+            if start + self.block_size >= n:
+                break
+
+            accuracy = correct / seen
+            margin = np.sqrt(log_term / (2.0 * seen))
+            lower, upper = accuracy - margin, accuracy + margin
+            for members in groups:
+                k = self._survivors(config, len(members))
+                if k >= len(members):
+                    continue
+                cutoff = np.partition(lower[members], -k)[-k]
+                active[members[active[members] & (upper[members] < cutoff)]] = False
+
+        for genome, c, s in zip(genomes, correct, seen):
+            genome.fitness = float(c / s)
+
+        eliminated = int(np.count_nonzero(~active))
+        skipped = int(n * len(genomes) - seen.sum())
+        self.eliminated += eliminated
+        self.skipped_rows += skipped
+        self.total_rows += n * len(genomes)
+        self.history.append({'eliminated': eliminated, 'skipped_rows': skipped})
+
+    def summary(self):
+        rate = self.skipped_rows / self.total_rows if self.total_rows else 0.0
+        return "Racing: {0} genomes eliminated, {1} row-evaluations skipped ({2:.1%})".format(
+            self.eliminated, self.skipped_rows, rate)
+
+    def end_generation(self, config, population, species_set):
+        self.species_set = species_set
+        if self.history:
+            print("{0} [last generation: {1[eliminated]} eliminated, {1[skipped_rows]} skipped]".format(
+                self.summary(), self.history[-1]))
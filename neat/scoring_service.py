@@ -0,0 +1,346 @@
+"""
+Serviço local de scoring de risco de go-around.
+
+Servidor HTTP mínimo sobre ``asyncio`` (TCP ou Unix socket) que mantém em
+memória o genoma vencedor compilado e a normalização de treino, lidos do
+``ModelBundle`` salvo por train.py. As
+requisições são agrupadas em micro-lotes antes da inferência, o vencedor pode
+ser recarregado sem derrubar requisições em andamento, e a latência é exposta
+como p50/p99 em ``GET /metrics``.
+
+Endpoints:
+    POST /predict  corpo JSON: uma aproximação (objeto com SELECTED_COLUMNS)
+                   ou uma lista de aproximações (objetos ou listas na ordem
+                   de SELECTED_COLUMNS); resposta ``{"probabilities": [...]}``
+    POST /reload   recarrega o vencedor ou o bundle dos caminhos configurados
+    GET  /metrics  contadores e percentis de latência
+    GET  /health   ``{"status": "ok"}``
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+from collections import deque
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from inference import WinnerModel, WINNER_PATH, CONFIG_PATH, BUNDLE_PATH
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils"))
+from feature_engineering import SELECTED_COLUMNS, load_features
+from model_bundle import ModelBundle
+
+X_PATH = "data/X.npy"
+Y_PATH = "data/y.npy"
+MAX_BATCH = 1024
+MAX_DELAY = 0.002
+LATENCY_WINDOW = 10_000
+MAX_BODY = 8 << 20
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def load_bundle(bundle_path=BUNDLE_PATH):
+    """
+    Carrega modelo e normalização de um ``ModelBundle`` gerado por train.py.
+
+    Returns:
+        tuple: (WinnerModel, ModelBundle); o bundle faz o papel do scaler
+    """
+    bundle = ModelBundle.load(bundle_path)
+    return WinnerModel.from_bundle(bundle), bundle
+
+
+def fit_training_scaler():
+    """Reajusta o StandardScaler na mesma partição de treino usada por train.py
+    (usado apenas quando não há ``ModelBundle``)."""
+    X, y = load_features(X_PATH, Y_PATH)
+    X_train, _, _, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    return StandardScaler().fit(X_train)
+
+
+def parse_instances(payload):
+    """
+    Converte o corpo JSON em uma matriz na ordem de SELECTED_COLUMNS.
+
+    Returns:
+        numpy.ndarray: Matriz (n_amostras, len(SELECTED_COLUMNS))
+
+    Raises:
+        ValueError: Campos ausentes, número de features errado ou valores
+            não finitos (NaN/Infinity)
+    """
+    instances = payload if isinstance(payload, list) else [payload]
+    rows = []
+    for instance in instances:
+        if isinstance(instance, dict):
+            missing = [c for c in SELECTED_COLUMNS if c not in instance]
+            if missing:
+                raise ValueError(f"campos ausentes: {missing}")
+            rows.append([instance[c] for c in SELECTED_COLUMNS])
+        else:
+            if len(instance) != len(SELECTED_COLUMNS):
+                raise ValueError(f"esperadas {len(SELECTED_COLUMNS)} features, recebidas {len(instance)}")
+            rows.append(instance)
+    X = np.asarray(rows, dtype=np.float64).reshape(-1, len(SELECTED_COLUMNS))
+    if not np.isfinite(X).all():
+        raise ValueError("features com valores não finitos (NaN/Infinity)")
+    return X
+
+
+class ScoringService(object):
+    """
+    Serviço de scoring com micro-batching e hot-reload.
+
+    Args:
+        model (WinnerModel): Modelo compilado
+        scaler: Objeto com ``transform`` (``StandardScaler`` ou ``ModelBundle``)
+        max_batch (int): Máximo de linhas por micro-lote
+        max_delay (float): Espera máxima (s) para completar um micro-lote
+        winner_path (str): Genoma recarregado por padrão (``/reload``, SIGHUP)
+        config_path (str): Configuração NEAT usada nas recargas
+        bundle_path (str, optional): Se informado, as recargas leem o bundle
+            e trocam modelo e scaler juntos
+        max_body (int): Tamanho máximo (bytes) do corpo de uma requisição
+    """
+
+    def __init__(self, model, scaler, max_batch=MAX_BATCH, max_delay=MAX_DELAY,
+                 winner_path=WINNER_PATH, config_path=CONFIG_PATH, bundle_path=None, max_body=MAX_BODY):
+        self.model = model
+        self.winner_path = winner_path
+        self.bundle_path = bundle_path
+        self.scaler = scaler
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.config_path = config_path
+        self.max_body = max_body
+        self.queue = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.reloads = 0
+        self.errors = 0
+
+    async def predict(self, X):
+        """Enfileira uma matriz de features e aguarda as probabilidades."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((X, future))
+        return await future
+
+    async def _batcher(self):
+        while True:
+            items = [await self.queue.get()]
+            n = len(items[0][0])
+            deadline = time.perf_counter() + self.max_delay
+            while n < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n += len(item[0])
+
+            # Referências locais: um reload concorrente não afeta o lote atual
+            model, scaler = self.model, self.scaler
+            try:
+                X = np.concatenate([x for x, _ in items])
+                scores = model.predict_proba(scaler.transform(X))
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += n
+            start = 0
+            for x, future in items:
+                if not future.done():
+                    future.set_result(scores[start:start + len(x)])
+                start += len(x)
+
+    async def reload(self):
+        """
+        Compila o novo vencedor fora do event loop e troca a referência.
+
+        Só lê os caminhos configurados na inicialização: arquivos pickle de
+        outros caminhos nunca são carregados por requisição.
+        """
+        loop = asyncio.get_running_loop()
+        if self.bundle_path:
+            model, scaler = await loop.run_in_executor(None, load_bundle, self.bundle_path)
+        else:
+            model = await loop.run_in_executor(None, WinnerModel.load, self.winner_path,
+                                               self.config_path)
+            scaler = self.scaler
+        self.model, self.scaler = model, scaler
+        self.reloads += 1
+
+    async def _reload_on_signal(self):
+        # Nenhuma requisição aguarda esta recarga: a falha é registrada aqui
+        try:
+            await self.reload()
+        except Exception as e:
+            self.errors += 1
+            print(f"Falha ao recarregar o modelo (o anterior continua em uso): {e!r}", file=sys.stderr)
+
+    def metrics(self):
+        latencies = np.asarray(self.latencies) * 1000.0
+        return {
+            'requests': self.requests,
+            'rows': self.rows,
+            'batches': self.batches,
+            'avg_batch_rows': self.rows / self.batches if self.batches else 0.0,
+            'errors': self.errors,
+            'reloads': self.reloads,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies, 50)) if len(latencies) else None,
+                'p99': float(np.percentile(latencies, 99)) if len(latencies) else None
+            }
+        }
+
+    async def _route(self, method, path, body):
+        if path == '/predict':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}
+            start = time.perf_counter()
+            scores = await self.predict(parse_instances(json.loads(body)))
+            self.latencies.append(time.perf_counter() - start)
+            self.requests += 1
+            return 200, {'probabilities': scores.tolist()}
+        if path == '/reload':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}
+            if body.strip() and json.loads(body):
+                return 400, {'error': '/reload não aceita parâmetros; recarrega os caminhos configurados'}
+            await self.reload()
+            return 200, {'status': 'reloaded', 'reloads': self.reloads}
+        if path == '/metrics':
+            return 200, self.metrics()
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f'rota desconhecida: {path}'}
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        try:
+            data = json.dumps(payload, allow_nan=False).encode()
+        except ValueError:
+            # JSON estrito não tem NaN/Infinity
+            self.errors += 1
+            status = 500
+            data = json.dumps({'error': 'resposta com valores não finitos'}).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= self.max_body:
+                    # O corpo não é lido: a conexão é encerrada após a resposta
+                    self.errors += 1
+                    status = 400 if length < 0 else 413
+                    error = ('content-length inválido' if length < 0
+                             else f'corpo maior que {self.max_body} bytes')
+                    await self._respond(writer, status, {'error': error}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length)
+
+                try:
+                    status, payload = await self._route(method, path, body)
+                except (ValueError, KeyError, TypeError) as e:
+                    self.errors += 1
+                    status, payload = 400, {'error': str(e)}
+                except Exception as e:
+                    self.errors += 1
+                    status, payload = 500, {'error': str(e)}
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000, unix_path=None):
+        """Inicia o servidor (TCP ou Unix socket) e o micro-batcher."""
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self._reload_on_signal()))
+        except (NotImplementedError, AttributeError):
+            pass
+        if unix_path:
+            server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço de scoring de go-around")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", default=None, help="caminho de Unix socket (substitui host/porta)")
+    parser.add_argument("--winner", default=WINNER_PATH)
+    parser.add_argument("--config", default=CONFIG_PATH)
+    parser.add_argument("--bundle", default=BUNDLE_PATH,
+                        help="ModelBundle com genoma e scaler (usado se existir)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-delay-ms", type=float, default=MAX_DELAY * 1000)
+    parser.add_argument("--max-body-mb", type=float, default=MAX_BODY / (1 << 20),
+                        help="tamanho máximo do corpo de uma requisição")
+    args = parser.parse_args()
+
+    bundle_path = args.bundle if os.path.isfile(args.bundle) else None
+    if bundle_path:
+        model, scaler = load_bundle(bundle_path)
+    else:
+        model, scaler = WinnerModel.load(args.winner, args.config), fit_training_scaler()
+    service = ScoringService(
+        model,
+        scaler,
+        max_batch=args.max_batch,
+        max_delay=args.max_delay_ms / 1000.0,
+        winner_path=args.winner,
+        config_path=args.config,
+        bundle_path=bundle_path,
+        max_body=int(args.max_body_mb * (1 << 20))
+    )
+    asyncio.run(service.serve(args.host, args.port, args.unix))
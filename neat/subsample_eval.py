@@ -0,0 +1,113 @@
+"""
+Fitness estocástico por mini-lote com reavaliação periódica no conjunto completo.
+
+A cada geração, todos os genomas são avaliados em uma amostra estratificada
+de ``X_train`` (preservando a proporção de go-arounds). A cada ``full_every``
+gerações os elites são reavaliados no conjunto completo e, em toda geração, o
+melhor genoma é reavaliado no conjunto completo (até que o máximo da geração
+seja exato), de modo que ``neat.Population.best_genome``, os reporters e o
+critério de parada só enxergam fitness exatos no topo.
+"""
+
+import numpy as np
+
+from batch_eval import score_genomes
+
+
+def stratified_sample(class_rows, size, rng):
+    """
+    Sorteia ``size`` linhas mantendo a proporção de cada classe.
+
+    Args:
+        class_rows (list): Arrays com os índices de cada classe
+        size (int): Tamanho da amostra
+        rng (numpy.random.Generator): Gerador aleatório
+
+    Returns:
+        numpy.ndarray: Índices sorteados, em ordem crescente
+    """
+    total = sum(len(rows) for rows in class_rows)
+    picks = []
+    for rows in class_rows:
+        n = min(len(rows), max(1, int(round(size * len(rows) / total))))
+        picks.append(rng.choice(rows, n, replace=False))
+    return np.sort(np.concatenate(picks))
+
+
+class SubsampleEvaluator(object):
+    """
+    Função de fitness por amostragem estratificada para ``neat.Population.run``.
+
+    Args:
+        X (numpy.ndarray): Features de treino
+        y (numpy.ndarray): Rótulos de treino
+        sample_size (int): Linhas sorteadas por geração
+        full_every (int): Intervalo (em gerações) da reavaliação completa dos elites
+        top_k (int, optional): Elites reavaliados (None usa ``elitism`` da config)
+        seed (int, optional): Semente do sorteio
+        score (callable, optional): ``score(genomes, config, rows)``; por padrão
+            avalia em série com ``batch_eval.score_genomes`` (use
+            ``SharedMemoryEvaluator.score`` para avaliar no pool)
+    """
+
+    def __init__(self, X, y, sample_size, full_every=10, top_k=None, seed=None, score=None):
+        if full_every < 1:
+            raise ValueError(f"full_every deve ser >= 1 (recebido {full_every})")
+        self.X = X
+        self.y = y
+        self.sample_size = sample_size
+        self.full_every = full_every
+        self.top_k = top_k
+        self.rng = np.random.default_rng(seed)
+        self.score = score or (lambda genomes, config, rows: score_genomes(genomes, config, X, y, rows))
+        self.class_rows = [np.flatnonzero(y == c) for c in np.unique(y)]
+        self.generation = 0
+        self.full_evaluations = 0
+
+    def get_state(self):
+        """Estado necessário para retomar o sorteio a partir de um checkpoint."""
+        return {
+            'rng': self.rng.bit_generator.state,
+            'generation': self.generation,
+            'full_evaluations': self.full_evaluations
+        }
+
+    def set_state(self, state):
+        self.rng.bit_generator.state = state['rng']
+        self.generation = state['generation']
+        self.full_evaluations = state['full_evaluations']
+
+    def _rescore(self, genomes, config):
+        for genome, fitness in zip(genomes, self.score(genomes, config, None)):
+            genome.fitness = fitness
+        self.full_evaluations += len(genomes)
+
+    def evaluate(self, genomes, config):
+        genomes = [g for _, g in genomes]
+        if self.sample_size >= len(self.y):
+            self._rescore(genomes, config)
+            self.generation += 1
+            return
+
+        rows = stratified_sample(self.class_rows, self.sample_size, self.rng)
+        for genome, fitness in zip(genomes, self.score(genomes, config, rows)):
+            genome.fitness = fitness
+
+        periodic = self.generation % self.full_every == 0
+        exact = set()
+        if periodic:
+            top_k = self.top_k if self.top_k is not None else config.reproduction_config.elitism
+            elites = sorted(genomes, key=lambda g: g.fitness, reverse=True)[:max(1, top_k)]
+            self._rescore(elites, config)
+            exact.update(id(g) for g in elites)
+
+        # O melhor genoma (vencedor reportado, melhor de todos da população e
+        # base do critério de parada) precisa de fitness exato em toda geração
+        while True:
+            best = max(genomes, key=lambda g: g.fitness)
+            if id(best) in exact:
+                break
+            self._rescore([best], config)
+            exact.add(id(best))
+
+        self.generation += 1
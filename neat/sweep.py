@@ -0,0 +1,291 @@
+"""
+Busca de hiperparâmetros do NEAT com validação cruzada estratificada.
+
+Cada trial é uma variação de ``config_neat.txt`` gerada em memória a partir de
+um espaço de busca (grade ou amostragem aleatória). Cada trial roda k folds
+estratificados em um pool de processos que compartilha X/y em memória
+(``parallel_eval``). A poda usa successive halving sobre gerações: todos os
+trials começam com ``min_generations``; a cada rodada só a fração ``1/eta``
+melhor (acurácia média de validação) continua, a partir do estado salvo, com
+``eta`` vezes mais gerações, até ``max_generations``.
+
+Espaço de busca (JSON), com chaves ``Seção.chave`` ou só ``chave``:
+    {"compatibility_threshold": [2.0, 3.0, 4.0],          # grade / escolha
+     "weight_mutate_rate": {"uniform": [0.5, 0.9]},       # só random
+     "node_add_prob": {"loguniform": [0.05, 0.5]},
+     "pop_size": {"int": [30, 150]}}
+
+Uso:
+    python neat/sweep.py --space space.json --search random --trials 20 --folds 3
+    python neat/sweep.py --param compatibility_threshold=2,3,4 --param pop_size=50,100
+"""
+
+import os
+import json
+import math
+import time
+import random
+import pickle
+import argparse
+import itertools
+import configparser
+from io import StringIO
+from datetime import datetime
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+import neat
+from sklearn.model_selection import StratifiedKFold
+
+from batch_eval import score_genomes
+from inference import CONFIG_PATH, config_from_text
+from parallel_eval import _share_array, _init_worker, _worker
+from checkpointing import population_state, dumps_state, restore_population
+
+SWEEP_DIR = "neat/sweeps"
+DISTRIBUTIONS = ('uniform', 'loguniform', 'int', 'choice')
+
+
+def resolve_key(parser, key):
+    """
+    Resolve ``chave`` ou ``Seção.chave`` para (seção, chave) da config.
+
+    Raises:
+        KeyError: Chave inexistente ou ambígua
+    """
+    if '.' in key:
+        section, option = key.split('.', 1)
+        if not parser.has_option(section, option):
+            raise KeyError(f"Chave {key!r} não existe na config")
+        return section, option
+    sections = [s for s in parser.sections() if parser.has_option(s, key)]
+    if len(sections) != 1:
+        raise KeyError(f"Chave {key!r} {'ambígua' if sections else 'não existe'} na config")
+    return sections[0], key
+
+
+def render_config(base_text, params):
+    """Texto de config com ``params`` substituídos (sem tocar no arquivo base)."""
+    parser = configparser.ConfigParser()
+    parser.read_string(base_text)
+    for key, value in params.items():
+        section, option = resolve_key(parser, key)
+        parser.set(section, option, ' '.join(map(str, value)) if isinstance(value, list) else str(value))
+    out = StringIO()
+    parser.write(out)
+    return out.getvalue()
+
+
+def grid_trials(space):
+    """Produto cartesiano de um espaço em que cada valor é uma lista."""
+    keys = list(space)
+    for key in keys:
+        if not isinstance(space[key], list):
+            raise ValueError(f"Busca em grade exige listas de valores ({key!r})")
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def sample_value(spec, rng):
+    if isinstance(spec, list):
+        return spec[rng.integers(len(spec))]
+    (kind, args), = spec.items()
+    if kind == 'uniform':
+        return float(rng.uniform(*args))
+    if kind == 'loguniform':
+        return float(math.exp(rng.uniform(math.log(args[0]), math.log(args[1]))))
+    if kind == 'int':
+        return int(rng.integers(args[0], args[1] + 1))
+    if kind == 'choice':
+        return args[rng.integers(len(args))]
+    raise ValueError(f"Distribuição desconhecida {kind!r} (use {DISTRIBUTIONS})")
+
+
+def random_trials(space, n_trials, seed=None):
+    rng = np.random.default_rng(seed)
+    return [{key: sample_value(spec, rng) for key, spec in space.items()} for _ in range(n_trials)]
+
+
+def _init_sweep_worker(x_spec, y_spec, folds, seed):
+    _init_worker(x_spec, y_spec, None)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    _worker['folds'] = list(splitter.split(np.zeros(len(_worker['y'])), _worker['y']))
+    _worker['configs'] = {}
+
+
+def _run_fold(task):
+    """Avança um fold de um trial até ``generations`` e mede a acurácia de validação."""
+    trial_id, fold, config_text, state, generations, seed = task
+    configs = _worker['configs']
+    if config_text not in configs:
+        configs[config_text] = config_from_text(config_text)
+    config = configs[config_text]
+    train, val = _worker['folds'][fold]
+    X, y = _worker['X'], _worker['y']
+    X_train, y_train = X[train], y[train]
+
+    if state is None:
+        random.seed(seed)
+        p = neat.Population(config)
+    else:
+        p = restore_population(pickle.loads(state))
+
+    def fitness(genomes, config):
+        genomes = [g for _, g in genomes]
+        for genome, f in zip(genomes, score_genomes(genomes, config, X_train, y_train)):
+            genome.fitness = f
+
+    start = time.perf_counter()
+    if generations > p.generation:
+        p.run(fitness, generations - p.generation)
+    elapsed = time.perf_counter() - start
+    best = p.best_genome
+    val_accuracy = score_genomes([best], config, X[val], y[val])[0]
+    solved = best.fitness >= config.fitness_threshold
+    return trial_id, fold, dumps_state(population_state(p)), val_accuracy, best.fitness, solved, elapsed
+
+
+class SweepRunner(object):
+    """
+    Executa trials NEAT com k-fold estratificado e successive halving.
+
+    Args:
+        X (numpy.ndarray): Features (já normalizadas)
+        y (numpy.ndarray): Rótulos
+        trials (list): Dicts de parâmetros de cada trial
+        base_text (str): Conteúdo da config base
+        folds (int): Número de folds estratificados
+        min_generations (int): Gerações da primeira rodada
+        max_generations (int): Gerações máximas de um trial
+        eta (int): Fator de redução do successive halving
+        workers (int): Processos do pool (None usa ``os.cpu_count()``)
+        seed (int): Semente dos folds e das populações
+    """
+
+    def __init__(self, X, y, trials, base_text, folds=3, min_generations=5, max_generations=50,
+                 eta=3, workers=None, seed=0):
+        self.X = X
+        self.y = y
+        self.trials = trials
+        self.configs = [render_config(base_text, params) for params in trials]
+        self.folds = folds
+        self.min_generations = min_generations
+        self.max_generations = max_generations
+        self.eta = eta
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+
+    def budgets(self):
+        """Gerações de cada rodada: min, min*eta, ..., max."""
+        budgets = [self.min_generations]
+        while budgets[-1] < self.max_generations:
+            budgets.append(min(budgets[-1] * self.eta, self.max_generations))
+        return budgets
+
+    def run(self):
+        """
+        Returns:
+            pandas.DataFrame: Uma linha por trial, ordenada pela acurácia de validação
+        """
+        x_shm, x_spec = _share_array(self.X)
+        y_shm, y_spec = _share_array(self.y)
+        records = {
+            i: dict(params, trial=i, rung=0, generations=0, pruned=False, solved=False, seconds=0.0)
+            for i, params in enumerate(self.trials)
+        }
+        states = {}
+        active = list(range(len(self.trials)))
+        try:
+            with Pool(self.workers, initializer=_init_sweep_worker,
+                      initargs=(x_spec, y_spec, self.folds, self.seed)) as pool:
+                for rung, generations in enumerate(self.budgets()):
+                    tasks = [
+                        (i, fold, self.configs[i], states.get((i, fold)), generations,
+                         self.seed + 1000 * i + fold)
+                        for i in active for fold in range(self.folds)
+                    ]
+                    scores = {i: [] for i in active}
+                    for i, fold, state, val_acc, train_fit, solved, elapsed in \
+                            pool.imap_unordered(_run_fold, tasks):
+                        states[(i, fold)] = state
+                        scores[i].append((val_acc, train_fit, solved))
+                        records[i]['seconds'] += elapsed
+                    for i in active:
+                        val, train, solved = zip(*scores[i])
+                        records[i].update(rung=rung, generations=generations, solved=all(solved),
+                                          val_accuracy=float(np.mean(val)), val_std=float(np.std(val)),
+                                          train_fitness=float(np.mean(train)))
+                    print(f"Rodada {rung}: {len(active)} trials x {self.folds} folds, "
+                          f"{generations} gerações")
+                    if generations >= self.max_generations:
+                        break
+                    keep = max(1, len(active) // self.eta)
+                    ranked = sorted(active, key=lambda i: records[i]['val_accuracy'], reverse=True)
+                    for i in ranked[keep:]:
+                        records[i]['pruned'] = True
+                        for fold in range(self.folds):
+                            states.pop((i, fold), None)
+                    active = ranked[:keep]
+        finally:
+            for shm in (x_shm, y_shm):
+                shm.close()
+                shm.unlink()
+
+        table = pd.DataFrame(records.values())
+        params = [c for c in table.columns if c not in ('trial', 'rung', 'generations', 'pruned', 'solved',
+                                                       'seconds', 'val_accuracy', 'val_std', 'train_fitness')]
+        table = table[['trial'] + params + [c for c in table.columns if c != 'trial' and c not in params]]
+        return table.sort_values(['generations', 'val_accuracy'], ascending=False).reset_index(drop=True)
+
+
+def parse_param(text):
+    """``chave=v1,v2`` -> (chave, [valores]) com conversão numérica quando possível."""
+    key, values = text.split('=', 1)
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(json.loads(value))
+        except ValueError:
+            parsed.append(value)
+    return key, parsed
+
+
+if __name__ == "__main__":
+    from train import load_training_data
+
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros NEAT com k-fold e successive halving")
+    parser.add_argument("--space", default=None, help="arquivo JSON com o espaço de busca")
+    parser.add_argument("--param", action="append", default=[], help="chave=v1,v2,... (grade)")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--trials", type=int, default=20, help="trials da busca aleatória")
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--min-generations", type=int, default=5)
+    parser.add_argument("--max-generations", type=int, default=50)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="processos (0 = todos os núcleos)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", default=CONFIG_PATH)
+    parser.add_argument("--output", default=None, help="CSV de resultados")
+    args = parser.parse_args()
+
+    space = {}
+    if args.space:
+        with open(args.space) as f:
+            space.update(json.load(f))
+    space.update(parse_param(p) for p in args.param)
+    if not space:
+        parser.error("informe --space e/ou --param")
+    trials = grid_trials(space) if args.search == "grid" else random_trials(space, args.trials, args.seed)
+
+    with open(args.config) as f:
+        base_text = f.read()
+    X_train, _, y_train, _, _ = load_training_data()
+    runner = SweepRunner(X_train, y_train, trials, base_text, args.folds, args.min_generations,
+                         args.max_generations, args.eta, args.workers or None, args.seed)
+    table = runner.run()
+
+    output = args.output or os.path.join(SWEEP_DIR, f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    table.to_csv(output, index=False)
+    print(table.to_string(index=False))
+    print(f"\nResultados salvos em {output}")
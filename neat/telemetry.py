@@ -0,0 +1,207 @@
+"""
+Telemetria de treinamento gravada em streaming.
+
+``TelemetryReporter`` acrescenta um registro por geração a um arquivo JSON
+Lines (``.jsonl``) ou CSV (``.csv``) assim que a geração termina, com as
+mesmas colunas de ``visualizations.export_training_log``. Só estatísticas
+resumidas e janelas deslizantes ficam em memória, de modo que o uso de memória
+não cresce com o número de gerações e o progresso pode ser acompanhado com
+``tail -f``.
+"""
+
+import os
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from neat.reporting import BaseReporter
+
+
+class TelemetryReporter(BaseReporter):
+    """
+    Reporter que grava um registro por geração.
+
+    Args:
+        path (str): Arquivo de saída; ``.csv`` grava CSV, qualquer outra
+            extensão grava JSON Lines. Se já existir, os registros são
+            acrescentados. Salvo num checkpoint, o reporter guarda o estado
+            das janelas (sem o arquivo) e, ao retomar, continua o mesmo arquivo
+            com melhor de todos, gerações sem melhora e médias coerentes
+        flush_every (int): Gerações entre flushes do arquivo (0 deixa a
+            cargo do buffer do sistema; o arquivo é sempre esvaziado no fim)
+        window (int): Gerações das médias deslizantes
+        profiler (profiling.ProfilingReporter, optional): Métricas de
+            desempenho mescladas a cada registro (adicione este reporter
+            depois do profiler)
+    """
+
+    def __init__(self, path, flush_every=1, window=10, profiler=None):
+        self.window = window
+        self.best_ever = None
+        self.best_generation = None
+        self._best = deque(maxlen=window)
+        self._avg = deque(maxlen=window)
+        self._generation = 0
+        self._record = None
+        self._written = 0
+        self._start = time.perf_counter()
+        self._file = None
+        self._writer = None
+        self.reopen(path, flush_every, profiler)
+
+    def reopen(self, path, flush_every=None, profiler=None, resume_generation=None):
+        """
+        Passa a gravar em ``path`` (aberto em modo append na próxima escrita).
+
+        Usado ao retomar um checkpoint, já que o arquivo e o profiler não são
+        serializados.
+
+        Args:
+            resume_generation (int, optional): Geração em que a execução é
+                retomada; os registros dessa geração em diante (gravados depois
+                do checkpoint) e linhas incompletas são removidos do arquivo,
+                para não aparecerem duas vezes
+        """
+        if self._file is not None:
+            self._file.close()
+        self.path = path
+        self.format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        if flush_every is not None:
+            self.flush_every = flush_every
+        self.profiler = profiler
+        self._file = None
+        self._writer = None
+        if resume_generation is not None and os.path.exists(path):
+            self._truncate(resume_generation)
+
+    def _truncate(self, generation):
+        """Reescreve o arquivo (via arquivo temporário) só com as gerações anteriores a ``generation``."""
+        tmp = self.path + '.tmp'
+        with open(self.path, newline='') as src, open(tmp, 'w', newline='') as dst:
+            if self.format == 'csv':
+                reader = csv.reader(src)
+                header = next(reader, None)
+                if header is not None:
+                    writer = csv.writer(dst)
+                    writer.writerow(header)
+                    column = header.index('generation')
+                    for row in reader:
+                        if len(row) == len(header) and int(row[column]) < generation:
+                            writer.writerow(row)
+            else:
+                for line in src:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record['generation'] < generation:
+                        dst.write(line if line.endswith('\n') else line + '\n')
+        os.replace(tmp, self.path)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, 'a', newline='')
+        if self.format == 'csv':
+            self._writer = None
+            self._header = new_file
+
+    def start_generation(self, generation):
+        self._generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        fitness = np.fromiter((g.fitness for g in population.values()), dtype=np.float64,
+                              count=len(population))
+        sizes = [len(s.members) for s in species.species.values()]
+        best = float(fitness.max())
+        if self.best_ever is None or best > self.best_ever:
+            self.best_ever = best
+            self.best_generation = self._generation
+        self._best.append(best)
+        self._avg.append(float(fitness.mean()))
+        self._record = {
+            'generation': self._generation,
+            'best_fitness': best,
+            'avg_fitness': float(fitness.mean()),
+            'std_fitness': float(fitness.std()),
+            'num_species': len(sizes),
+            'avg_species_size': float(np.mean(sizes)) if sizes else 0,
+            'max_species_size': max(sizes, default=0),
+            'best_ever': self.best_ever,
+            'generations_since_best': self._generation - self.best_generation,
+            f'best_fitness_mean{self.window}': float(np.mean(self._best)),
+            f'avg_fitness_mean{self.window}': float(np.mean(self._avg)),
+            'best_nodes': len(best_genome.nodes),
+            'best_connections': sum(1 for c in best_genome.connections.values() if c.enabled),
+            'elapsed': time.perf_counter() - self._start
+        }
+
+    def _write(self):
+        if self._record is None:
+            return
+        record = self._record
+        self._record = None
+        if self.profiler is not None and self.profiler.records \
+                and self.profiler.records[-1]['generation'] == record['generation']:
+            record.update({k: v for k, v in self.profiler.records[-1].items() if k != 'generation'})
+        if self._file is None:
+            self._open()
+        if self.format == 'csv':
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._file, fieldnames=list(record), extrasaction='ignore')
+                if self._header:
+                    self._writer.writeheader()
+            self._writer.writerow(record)
+        else:
+            self._file.write(json.dumps(record) + '\n')
+        self._written += 1
+        if self.flush_every and self._written % self.flush_every == 0:
+            self._file.flush()
+
+    def end_generation(self, config, population, species_set):
+        self._write()
+
+    def found_solution(self, config, generation, best):
+        # Population.run sai do loop antes de end_generation
+        self._write()
+
+    def close(self):
+        self._write()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def __getstate__(self):
+        # Checkpoints guardam só o estado resumido: sem arquivo nem profiler
+        state = self.__dict__.copy()
+        state.update(_file=None, _writer=None, profiler=None, _record=None,
+                     _elapsed=time.perf_counter() - self._start)
+        del state['_start']
+        return state
+
+    def __setstate__(self, state):
+        elapsed = state.pop('_elapsed')
+        self.__dict__.update(state)
+        self._start = time.perf_counter() - elapsed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_telemetry(path):
+    """
+    Lê um arquivo gravado por ``TelemetryReporter``.
+
+    Returns:
+        pandas.DataFrame: Um registro por geração
+    """
+    if path.lower().endswith('.csv'):
+        return pd.read_csv(path)
+    return pd.read_json(path, lines=True)
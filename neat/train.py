@@ -1,45 +1,279 @@
 import os
+import sys
+import argparse
 import neat
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import classification_report
 import pickle
-from visualizations import (
-    plot_winner_net,
-    plot_fitness_history,
-    plot_species_evolution,
-    plot_genotype_embedding,
-    plot_confusion_matrix,
-    plot_roc_curve,
-    plot_precision_recall,
-    generate_classification_report,
-    export_training_log
-)
+from datetime import datetime
+from batch_eval import BatchFeedForwardNetwork, batch_accuracy
+from parallel_eval import SharedMemoryEvaluator
+from subsample_eval import SubsampleEvaluator
+from racing_eval import RacingEvaluator
+from fitness_cache import FitnessCache, DEFAULT_MAXSIZE
+from inference import WinnerModel, BUNDLE_PATH
+from profiling import ProfilingReporter, StackSampler, phase
+from genome_descriptors import DescriptorReporter
+from telemetry import TelemetryReporter
+from compact_stats import CompactStatisticsReporter
+from checkpointing import AsyncCheckpointer, restore_checkpoint, CHECKPOINT_DIR
+from islands import IslandModel
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils"))
+from feature_engineering import load_features
+from model_bundle import ModelBundle
 
 X_PATH = "data/X.npy"
 Y_PATH = "data/y.npy"
 CONFIG_PATH = "neat/config_neat.txt"
+WINNER_PATH = "neat/winner.pkl"
+GENERATIONS = 50
 
 def eval_genomes(genomes, config):
     for genome_id, genome in genomes:
-        net = neat.nn.FeedForwardNetwork.create(genome, config)
-        correct = 0
-        for xi, yi in zip(X_train, y_train):
-            output = net.activate(xi)
-            prediction = 1 if output[0] > 0.5 else 0
-            if prediction == yi:
-                correct += 1
-        genome.fitness = correct / len(X_train)
+        with phase('network_creation'):
+            net = BatchFeedForwardNetwork.create(genome, config)
+        with phase('activation'):
+            genome.fitness = batch_accuracy(net, X_train, y_train)
+
+def load_training_data():
+    """Carrega X/y, separa treino/teste e normaliza com um StandardScaler ajustado no treino."""
+    X, y = load_features(X_PATH, Y_PATH)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    X_test = scaler.transform(X_test)
+    return X_train, X_test, y_train, y_test, scaler
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Treinamento NEAT para predição de go-arounds")
+    parser.add_argument("--generations", type=int, default=GENERATIONS)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos de avaliação (1 = serial, 0 = todos os núcleos)")
+    parser.add_argument("--sample-size", type=int, default=None,
+                        help="linhas da amostra estratificada avaliada por geração")
+    parser.add_argument("--full-every", type=int, default=10,
+                        help="intervalo de reavaliação dos elites no conjunto completo")
+    parser.add_argument("--racing-block", type=int, default=None,
+                        help="avalia em blocos de N linhas e elimina genomas sem chance de sobreviver")
+    parser.add_argument("--cache-size", type=int, default=None,
+                        help=f"entradas do cache de fitness (0 desativa; padrão {DEFAULT_MAXSIZE})")
+    parser.add_argument("--checkpoint-every", type=int, default=None,
+                        help="gerações entre checkpoints")
+    parser.add_argument("--checkpoint-seconds", type=float, default=None,
+                        help="segundos entre checkpoints")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR)
+    parser.add_argument("--checkpoint-compression", choices=["none", "gzip", "lzma"], default="gzip")
+    parser.add_argument("--resume", default=None, help="checkpoint a partir do qual retomar")
+    parser.add_argument("--profile-dump", default=None,
+                        help="grava as pilhas do profiler por amostragem (formato collapsed) neste arquivo")
+    parser.add_argument("--profile-interval", type=float, default=0.005,
+                        help="segundos entre amostras do profiler")
+    parser.add_argument("--headless", action="store_true",
+                        help="não gera gráficos (os módulos de gráficos não são importados)")
+    parser.add_argument("--report-formats", default="html,png,svg",
+                        help="formatos dos gráficos (ex.: html para não usar o kaleido)")
+    parser.add_argument("--report-workers", type=int, default=2,
+                        help="processos que renderizam os gráficos em segundo plano")
+    parser.add_argument("--descriptors", default=None,
+                        help="salva os descritores de todos os genomas avaliados neste .npy")
+    parser.add_argument("--telemetry", default=None,
+                        help="grava um registro por geração neste .jsonl ou .csv (substitui o log final)")
+    parser.add_argument("--telemetry-flush", type=int, default=1,
+                        help="gerações entre flushes da telemetria (0 = buffer do sistema)")
+    parser.add_argument("--genome-spill", default=None,
+                        help="arquivo que recebe os melhores genomas antigos (por padrão são descartados)")
+    parser.add_argument("--islands", type=int, default=1,
+                        help="populações independentes (modelo de ilhas, 1 = desativado)")
+    parser.add_argument("--migration-interval", type=int, default=5,
+                        help="gerações entre migrações entre ilhas")
+    parser.add_argument("--migrants", type=int, default=2,
+                        help="genomas enviados por ilha a cada migração")
+    parser.add_argument("--coordinator", default=None,
+                        help="host:porta para publicar as filas das ilhas (ilhas remotas)")
+    parser.add_argument("--local-islands", type=int, default=None,
+                        help="ilhas executadas nesta máquina com --coordinator (as demais se conectam)")
+    args = parser.parse_args()
+    if args.full_every < 1:
+        parser.error("--full-every deve ser >= 1")
+    if args.racing_block and args.sample_size:
+        parser.error("--racing-block e --sample-size são mutuamente exclusivos")
+    # O fitness parcial dos eliminados pela corrida não é exato: sem cache nem pool
+    if args.racing_block and args.workers != 1:
+        parser.error("--racing-block avalia em série; não use com --workers")
+    if args.racing_block and args.cache_size:
+        parser.error("--racing-block não usa o cache de fitness; não use com --cache-size")
+    if args.cache_size is None:
+        args.cache_size = 0 if args.racing_block else DEFAULT_MAXSIZE
+    if args.telemetry and args.islands > 1:
+        parser.error("--telemetry não é suportado com --islands")
+    return args
 
 if __name__ == "__main__":
-    plot_winner_net(config, winner)
-    plot_fitness_history(stats)
-    plot_species_evolution(stats)
-    plot_genotype_embedding(stats)
-    plot_confusion_matrix(y_test, predictions)
-    plot_roc_curve(y_test, scores)
-    plot_precision_recall(y_test, scores)
-    report = generate_classification_report(y_test, predictions)
+    args = parse_args()
+
+    X_train, X_test, y_train, y_test, scaler = load_training_data()
+
+    config = neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        CONFIG_PATH
+    )
+    island_stats = None
+    profiler = None
+    descriptors = None
+    telemetry = None
+    if args.islands > 1:
+        address = None
+        if args.coordinator:
+            host, port = args.coordinator.rsplit(":", 1)
+            address = (host, int(port))
+        local_islands = None if args.local_islands is None else range(args.local_islands)
+        island_model = IslandModel(config, X_train, y_train, args.islands, args.migration_interval,
+                                   args.migrants, address=address, local_islands=local_islands)
+        winner, island_stats = island_model.run(args.generations)
+        stats = max(island_stats, key=lambda s: s.best_genome().fitness)
+    else:
+        evaluator = None
+        sampler = None
+        score = None
+        fitness_function = eval_genomes
+        if args.workers != 1:
+            evaluator = SharedMemoryEvaluator(args.workers or None, X_train, y_train, config)
+            score = evaluator.score
+            fitness_function = evaluator.evaluate
+        if args.cache_size:
+            cache = FitnessCache(X_train, y_train, score=score, maxsize=args.cache_size)
+            score = cache.score
+            fitness_function = cache.evaluate
+        if args.sample_size:
+            sampler = SubsampleEvaluator(X_train, y_train, args.sample_size, args.full_every, score=score)
+            fitness_function = sampler.evaluate
+        racer = None
+        if args.racing_block:
+            racer = RacingEvaluator(X_train, y_train, args.racing_block)
+            fitness_function = racer.evaluate
+        if racer:
+            profiler = ProfilingReporter(
+                lambda count: count * len(y_train) - racer.history[-1]['skipped_rows'])
+        else:
+            profiler = ProfilingReporter(args.sample_size or len(y_train))
+        fitness_function = profiler.timed(fitness_function)
+        extra = {'sampler': sampler} if sampler else {}
+        if racer:
+            extra['racer'] = racer
+
+        if args.resume:
+            p, reporters = restore_checkpoint(args.resume, extra=extra)
+            config = p.config
+            stats = reporters['stats']
+            descriptors = reporters.get('descriptors')
+            telemetry = reporters.get('telemetry')
+        else:
+            p = neat.Population(config)
+            stats = CompactStatisticsReporter(args.generations, spill_path=args.genome_spill)
+            p.add_reporter(stats)
+        # O buffer cresce com cada genoma avaliado: só quando será usado
+        keep_descriptors = bool(args.descriptors) or not args.headless
+        if descriptors is not None and not keep_descriptors:
+            p.reporters.remove(descriptors)
+            descriptors = None
+        if descriptors is None and keep_descriptors:
+            descriptors = DescriptorReporter()
+            p.add_reporter(descriptors)
+        p.add_reporter(neat.StdOutReporter(True))
+        p.add_reporter(profiler)
+        profiler.attach(p)
+        if telemetry is not None:
+            # Restaurado do checkpoint: volta depois do profiler (cujo registro ele mescla)
+            p.reporters.remove(telemetry)
+            if not args.telemetry:
+                telemetry = None
+        if telemetry is not None:
+            # Continua o arquivo (sem as gerações posteriores ao checkpoint) com o melhor
+            # de todos e as janelas salvos
+            telemetry.reopen(args.telemetry, args.telemetry_flush, profiler, resume_generation=p.generation)
+            p.add_reporter(telemetry)
+        elif args.telemetry:
+            telemetry = TelemetryReporter(args.telemetry, args.telemetry_flush, profiler=profiler)
+            p.add_reporter(telemetry)
+        if args.cache_size:
+            p.add_reporter(cache)
+        if racer:
+            racer.species_set = p.species
+            p.add_reporter(racer)
+        saved_reporters = {'stats': stats}
+        if descriptors is not None:
+            saved_reporters['descriptors'] = descriptors
+        if telemetry is not None:
+            saved_reporters['telemetry'] = telemetry
+        checkpointer = None
+        if args.checkpoint_every or args.checkpoint_seconds:
+            checkpointer = AsyncCheckpointer(
+                p,
+                generation_interval=args.checkpoint_every,
+                time_interval_seconds=args.checkpoint_seconds,
+                directory=args.checkpoint_dir,
+                compression=None if args.checkpoint_compression == "none" else args.checkpoint_compression,
+                reporters=saved_reporters,
+                extra=extra
+            )
+            p.add_reporter(checkpointer)
+
+        stack_sampler = StackSampler(args.profile_interval).start() if args.profile_dump else None
+        try:
+            winner = p.run(fitness_function, args.generations - p.generation)
+        finally:
+            if stack_sampler is not None:
+                stack_sampler.stop()
+                stack_sampler.dump(args.profile_dump)
+            if evaluator is not None:
+                evaluator.close()
+            if checkpointer is not None:
+                checkpointer.close()
+            if telemetry is not None:
+                telemetry.close()
+
+    with open(WINNER_PATH, "wb") as f:
+        pickle.dump(winner, f)
+    with open(CONFIG_PATH) as f:
+        ModelBundle.from_scaler(winner, 'neat', scaler, neat_config=f.read()).save(BUNDLE_PATH)
+
+    model = WinnerModel(winner, config)
+    scores = model.predict_proba(X_test)
+    predictions = model.predict(X_test)
+
+    pipeline = None
+    if not args.headless:
+        # Gráficos renderizados em segundo plano enquanto o restante termina
+        from visualizations import ReportPipeline
+        pipeline = ReportPipeline(args.report_workers, args.report_formats.split(","))
+        frame = None if descriptors is None else descriptors.to_frame()
+        pipeline.submit_training_reports(config, winner, stats, y_test, predictions, scores, frame)
+    report = classification_report(y_test, predictions)
     print("\nRelatório de Classificação:")
     print(report)
-    export_training_log(stats, config)
+
+    if args.telemetry:
+        print(f"Telemetria gravada em {args.telemetry}")
+    else:
+        # Só o exportador de log (pandas/json); não carrega os módulos de gráficos
+        from visualizations import export_training_log
+        if island_stats is None:
+            export_training_log(stats, config, profile=profiler.records)
+        else:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            for i, island in enumerate(island_stats):
+                export_training_log(island, config, filename=f"training_log_island{i}_{timestamp}")
+
+    if args.descriptors and descriptors is not None:
+        descriptors.save(args.descriptors)
+
+    if pipeline is not None:
+        for name, error in pipeline.wait().items():
+            print(f"Falha ao gerar {name}: {error}")
+        pipeline.shutdown()
@@ -6,36 +6,41 @@ Este módulo fornece um conjunto abrangente de funções para visualizar:
 - Performance preditiva do modelo
 - Análise genotípica
 - Visualizações espaciais e meteorológicas
+
+Os submódulos (e plotly, networkx, folium, umap, sklearn) são importados
+apenas no primeiro acesso a cada função, de modo que ``import visualizations``
+não pesa na inicialização do treinamento.
 """
 
-from .network_visualization import plot_winner_net
-from .evolution_visualization import (
-    plot_fitness_history,
-    plot_species_evolution,
-    plot_genotype_embedding
-)
-from .performance_visualization import (
-    plot_confusion_matrix,
-    plot_roc_curve,
-    plot_precision_recall,
-    generate_classification_report
-)
-from .spatial_visualization import (
-    plot_airport_ga_map,
-    plot_weather_vs_ga
-)
-from .utils import export_training_log
-
-__all__ = [
-    'plot_winner_net',
-    'plot_fitness_history',
-    'plot_species_evolution',
-    'plot_genotype_embedding',
-    'plot_confusion_matrix',
-    'plot_roc_curve',
-    'plot_precision_recall',
-    'generate_classification_report',
-    'plot_airport_ga_map',
-    'plot_weather_vs_ga',
-    'export_training_log'
-] 
\ No newline at end of file
+import importlib
+
+_SUBMODULES = {
+    'plot_winner_net': 'network_visualization',
+    'plot_fitness_history': 'evolution_visualization',
+    'plot_species_evolution': 'evolution_visualization',
+    'plot_genotype_embedding': 'evolution_visualization',
+    'plot_confusion_matrix': 'performance_visualization',
+    'plot_roc_curve': 'performance_visualization',
+    'plot_precision_recall': 'performance_visualization',
+    'generate_classification_report': 'performance_visualization',
+    'plot_airport_ga_map': 'spatial_visualization',
+    'plot_weather_vs_ga': 'spatial_visualization',
+    'aggregate_airports': 'spatial_visualization',
+    'weather_summary': 'spatial_visualization',
+    'export_training_log': 'utils',
+    'ReportPipeline': 'reports'
+}
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_SUBMODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
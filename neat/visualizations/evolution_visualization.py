@@ -3,22 +3,27 @@ Módulo para visualização da evolução das redes NEAT.
 """
 
 import os
+import sys
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import umap
-from sklearn.preprocessing import StandardScaler
 import statistics
-from sklearn.decomposition import PCA
+from .utils import save_figure, is_headless, fitness_extremes
 
-def plot_fitness_history(stats, view=True, filename="fitness_history"):
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from genome_descriptors import genome_descriptor, DESCRIPTOR_FIELDS, FEATURE_FIELDS
+
+def plot_fitness_history(stats, view=True, filename="fitness_history", formats=None):
     """
     Plota o histórico de fitness ao longo das gerações.
     
     Args:
-        stats (neat.StatisticsReporter): Estatísticas do treinamento
+        stats (CompactStatisticsReporter ou neat.StatisticsReporter): Estatísticas do
+            treinamento
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
@@ -31,16 +36,8 @@ def plot_fitness_history(stats, view=True, filename="fitness_history"):
         # Converter range para lista
         generations = list(range(len(fitness_mean)))
         
-        # Calcular max/min de forma segura
-        fitness_max = []
-        fitness_min = []
-        for scores in stats.get_fitness_stat(lambda x: x):
-            if scores:  # Verifica se a lista não está vazia
-                fitness_max.append(max(scores))
-                fitness_min.append(min(scores))
-            else:
-                fitness_max.append(0)
-                fitness_min.append(0)
+        # Máximo e mínimo (pré-calculados no CompactStatisticsReporter)
+        fitness_max, fitness_min = fitness_extremes(stats)
         
         # Criar figura
         fig = go.Figure()
@@ -90,15 +87,10 @@ def plot_fitness_history(stats, view=True, filename="fitness_history"):
             showlegend=True
         )
         
-        # Criar diretório se não existir
-        os.makedirs('neat/visualizations/output', exist_ok=True)
-        
         # Salvar figuras
-        fig.write_html(f'neat/visualizations/output/{filename}.html')
-        fig.write_image(f'neat/visualizations/output/{filename}.png')
-        fig.write_image(f'neat/visualizations/output/{filename}.svg')
+        save_figure(fig, filename, formats)
         
-        if view:
+        if view and not is_headless():
             fig.show()
         
         return fig
@@ -111,14 +103,16 @@ def plot_fitness_history(stats, view=True, filename="fitness_history"):
         print(f"Desvio padrão: {fitness_std}")
         raise
 
-def plot_species_evolution(stats, view=True, filename="species_evolution"):
+def plot_species_evolution(stats, view=True, filename="species_evolution", formats=None):
     """
     Plota a evolução das espécies ao longo das gerações.
     
     Args:
-        stats (neat.StatisticsReporter): Estatísticas do treinamento
+        stats (CompactStatisticsReporter ou neat.StatisticsReporter): Estatísticas do
+            treinamento
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
@@ -170,15 +164,10 @@ def plot_species_evolution(stats, view=True, filename="species_evolution"):
         fig.update_yaxes(title_text='Número de Espécies', row=1, col=1)
         fig.update_yaxes(title_text='Tamanho Médio', row=2, col=1)
         
-        # Criar diretório se não existir
-        os.makedirs('neat/visualizations/output', exist_ok=True)
-        
         # Salvar figuras
-        fig.write_html(f'neat/visualizations/output/{filename}.html')
-        fig.write_image(f'neat/visualizations/output/{filename}.png')
-        fig.write_image(f'neat/visualizations/output/{filename}.svg')
+        save_figure(fig, filename, formats)
         
-        if view:
+        if view and not is_headless():
             fig.show()
         
         return fig
@@ -190,111 +179,110 @@ def plot_species_evolution(stats, view=True, filename="species_evolution"):
         print(f"Tamanhos das espécies: {species_sizes}")
         raise
 
-def plot_genotype_embedding(stats, view=True, filename="genotype_embedding"):
+def _most_fit_descriptors(stats):
+    """Descritores do genoma mais apto de cada geração (sem DescriptorReporter)."""
+    generations = getattr(stats, 'most_fit_generations', range(len(stats.most_fit_genomes)))
+    rows = [genome_descriptor(genome, gen) for gen, genome in zip(generations, stats.most_fit_genomes)]
+    return pd.DataFrame(rows, columns=list(DESCRIPTOR_FIELDS))
+
+def plot_genotype_embedding(stats, view=True, filename="genotype_embedding", formats=None,
+                            descriptors=None, n_neighbors=15, pca_components=None, approximate=False,
+                            method='umap', max_points=None, seed=42):
     """
     Plota a evolução dos genótipos usando redução de dimensionalidade.
+
+    Com ``descriptors`` (ex.: ``DescriptorReporter.to_frame()``) o embedding
+    cobre todos os genomas avaliados na execução; sem eles, apenas o mais
+    apto de cada geração. Os pontos são desenhados com ``Scattergl`` (WebGL).
     
     Args:
-        stats (neat.StatisticsReporter): Estatísticas do treinamento
+        stats (CompactStatisticsReporter ou neat.StatisticsReporter): Estatísticas do
+            treinamento
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
+        descriptors (pandas.DataFrame, optional): Uma linha por genoma com as
+            colunas de DESCRIPTOR_FIELDS; FEATURE_FIELDS entram no embedding
+        n_neighbors (int): Vizinhos do UMAP (limitado a n - 1)
+        pca_components (int, optional): Pré-redução por PCA antes do UMAP
+        approximate (bool): Força os vizinhos aproximados (NN-descent) do UMAP
+            mesmo em conjuntos pequenos
+        method (str): ``'umap'`` ou ``'pca'`` (não exige umap)
+        max_points (int, optional): Amostra aleatória de no máximo N genomas
+        seed (int, optional): Semente da amostra e do UMAP (None permite
+            UMAP paralelo, não determinístico)
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
     """
-    try:
-        # Extrair características dos genomas mais aptos
-        features = []
-        fitnesses = []
-        generations = []
-        
-        # Usar apenas os genomas mais aptos de cada geração
-        for gen, genome in enumerate(stats.most_fit_genomes):
-            try:
-                # Extrair características
-                genome_features = [
-                    len(genome.nodes),
-                    len(genome.connections),
-                    np.mean([c.weight for c in genome.connections.values()]) if genome.connections else 0,
-                    np.std([c.weight for c in genome.connections.values()]) if genome.connections else 0,
-                    np.mean([n.bias for n in genome.nodes.values()]) if genome.nodes else 0,
-                    np.std([n.bias for n in genome.nodes.values()]) if genome.nodes else 0
-                ]
-                features.append(genome_features)
-                fitnesses.append(genome.fitness)
-                generations.append(gen)
-            except Exception as e:
-                print(f"Erro ao processar genoma da geração {gen}: {str(e)}")
-                continue
-        
-        if not features:
-            print("Nenhuma característica foi extraída dos genomas")
-            return None
-        
-        # Verificar se temos dados suficientes para UMAP
-        if len(features) < 3:
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.decomposition import PCA
+
+    if descriptors is None:
+        frame = _most_fit_descriptors(stats)
+        title = 'Visualização dos Genótipos Mais Aptos'
+    else:
+        frame = descriptors.to_frame() if hasattr(descriptors, 'to_frame') else pd.DataFrame(descriptors)
+        title = 'Visualização dos Genótipos Avaliados'
+    if frame.empty:
+        print("Nenhuma característica foi extraída dos genomas")
+        return None
+    if max_points and len(frame) > max_points:
+        rows = np.random.default_rng(seed).choice(len(frame), max_points, replace=False)
+        frame = frame.iloc[np.sort(rows)]
+
+    features = np.nan_to_num(frame[list(FEATURE_FIELDS)].to_numpy(dtype=np.float64))
+    features = StandardScaler().fit_transform(features)
+    if pca_components and pca_components < features.shape[1]:
+        features = PCA(n_components=pca_components, random_state=seed).fit_transform(features)
+
+    if method == 'umap' and len(features) >= 3:
+        # Importado só aqui: umap compila com numba ao ser importado
+        import umap
+        reducer = umap.UMAP(n_components=2, n_neighbors=min(n_neighbors, len(features) - 1),
+                            random_state=seed, force_approximation_algorithm=approximate,
+                            low_memory=True)
+        embedding = reducer.fit_transform(features)
+        method_name = "UMAP"
+    else:
+        if method == 'umap':
             print(f"Poucos dados para UMAP ({len(features)} genomas). Usando PCA em vez de UMAP.")
-            # Usar PCA para poucos dados
-            scaler = StandardScaler()
-            features_scaled = scaler.fit_transform(features)
-            
-            pca = PCA(n_components=2)
-            embedding = pca.fit_transform(features_scaled)
-            method_name = "PCA"
-        else:
-            # Usar UMAP para muitos dados
-            scaler = StandardScaler()
-            features_scaled = scaler.fit_transform(features)
-            
-            # Ajustar parâmetros do UMAP para poucos dados
-            n_neighbors = min(2, len(features) - 1)  # Máximo 2 vizinhos para poucos dados
-            reducer = umap.UMAP(n_components=2, n_neighbors=n_neighbors, random_state=42)
-            embedding = reducer.fit_transform(features_scaled)
-            method_name = "UMAP"
-        
-        # Criar figura
-        fig = go.Figure()
-        
-        # Adicionar pontos
-        fig.add_trace(go.Scatter(
-            x=embedding[:, 0],
-            y=embedding[:, 1],
-            mode='markers',
-            marker=dict(
-                size=12,
-                color=fitnesses,
-                colorscale='Viridis',
-                showscale=True,
-                colorbar=dict(title='Fitness')
-            ),
-            text=[f'Geração: {gen}<br>Fitness: {fit:.3f}<br>Nós: {len(stats.most_fit_genomes[gen].nodes)}<br>Conexões: {len(stats.most_fit_genomes[gen].connections)}' for gen, fit in zip(generations, fitnesses)],
-            hoverinfo='text'
-        ))
-        
-        # Atualizar layout
-        fig.update_layout(
-            title=f'Visualização dos Genótipos Mais Aptos ({method_name})',
-            xaxis_title=f'{method_name} 1',
-            yaxis_title=f'{method_name} 2',
-            hovermode='closest'
-        )
-        
-        # Criar diretório se não existir
-        os.makedirs('neat/visualizations/output', exist_ok=True)
-        
-        # Salvar figuras
-        fig.write_html(f'neat/visualizations/output/{filename}.html')
-        fig.write_image(f'neat/visualizations/output/{filename}.png')
-        fig.write_image(f'neat/visualizations/output/{filename}.svg')
-        
-        if view:
-            fig.show()
-        
-        return fig
-        
-    except Exception as e:
-        print(f"Erro ao plotar embedding dos genótipos: {str(e)}")
-        print("Dados disponíveis:")
-        print(f"Número de genomas mais aptos: {len(stats.most_fit_genomes)}")
-        print(f"Tamanhos das espécies: {stats.get_species_sizes()}")
-        raise 
\ No newline at end of file
+        embedding = PCA(n_components=2).fit_transform(features)
+        method_name = "PCA"
+
+    fitness = frame['fitness'].to_numpy(dtype=np.float64)
+    hover = [c for c in ('generation', 'key', 'fitness', 'nodes', 'connections') if c in frame]
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=embedding[:, 0],
+        y=embedding[:, 1],
+        mode='markers',
+        marker=dict(
+            size=4 if len(frame) > 1000 else 10,
+            opacity=0.6 if len(frame) > 1000 else 1.0,
+            color=fitness,
+            colorscale='Viridis',
+            showscale=True,
+            colorbar=dict(title='Fitness')
+        ),
+        customdata=frame[hover].to_numpy(dtype=np.float64),
+        hovertemplate='<br>'.join(
+            f'{name}: %{{customdata[{i}]:.3f}}' if name == 'fitness' else f'{name}: %{{customdata[{i}]:.0f}}'
+            for i, name in enumerate(hover)) + '<extra></extra>'
+    ))
+    
+    # Atualizar layout
+    fig.update_layout(
+        title=f'{title} ({method_name}, {len(frame):,} genomas)',
+        xaxis_title=f'{method_name} 1',
+        yaxis_title=f'{method_name} 2',
+        hovermode='closest'
+    )
+    
+    # Salvar figuras
+    save_figure(fig, filename, formats)
+    
+    if view and not is_headless():
+        fig.show()
+    
+    return fig
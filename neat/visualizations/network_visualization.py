@@ -1,15 +1,80 @@
 """
 Módulo para visualização de redes neurais NEAT.
+
+As arestas são desenhadas em poucos traces (sinal x faixa de |peso|, com
+coordenadas separadas por ``None``) e os nós ficam em camadas calculadas por
+``feed_forward_layers``, o que mantém leves o HTML e o ``write_image`` mesmo
+para genomas com milhares de conexões.
 """
 
-import os
+from functools import lru_cache
 import numpy as np
-import networkx as nx
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import neat
+from neat.graphs import feed_forward_layers
+from .utils import save_figure, is_headless
+
+# Limites de |peso| das faixas de arestas e a espessura de cada faixa
+WEIGHT_BUCKETS = (0.5, 1.5)
+BUCKET_WIDTHS = (0.5, 1.5, 3.0)
+EDGE_COLORS = {True: 'green', False: 'red'}
+
+def genome_structure(config, genome):
+    """
+    Chave da topologia do genoma (entradas, saídas, nós e conexões ativas).
+
+    Genomas com a mesma estrutura compartilham o layout em cache.
 
-def plot_winner_net(config, genome, view=True, filename="winner_network"):
+    Returns:
+        tuple: Tupla de tuplas ordenadas, hasheável
+    """
+    return (
+        tuple(config.genome_config.input_keys),
+        tuple(config.genome_config.output_keys),
+        tuple(sorted(genome.nodes)),
+        tuple(sorted(key for key, conn in genome.connections.items() if conn.enabled))
+    )
+
+@lru_cache(maxsize=256)
+def layered_layout(structure):
+    """
+    Posições dos nós em camadas feed-forward.
+
+    Entradas na coluna 0, camadas de ``feed_forward_layers`` em seguida e saídas
+    na última coluna; nós fora das camadas (sem caminho até a saída ou em
+    ciclos) ficam numa coluna antes das saídas. Em cada coluna os nós são
+    distribuídos uniformemente em y.
+
+    Args:
+        structure (tuple): Resultado de ``genome_structure``
+
+    Returns:
+        dict: {nó: (x, y)}
+    """
+    inputs, outputs, nodes, connections = structure
+    output_set = set(outputs)
+    columns = [list(inputs)]
+    placed = set(inputs) | output_set
+    for layer in feed_forward_layers(inputs, outputs, connections):
+        hidden = sorted(layer - output_set)
+        if hidden:
+            columns.append(hidden)
+            placed.update(hidden)
+    loose = [n for n in nodes if n not in placed]
+    if loose:
+        columns.append(loose)
+    columns.append(list(outputs))
+
+    pos = {}
+    last = max(len(columns) - 1, 1)
+    for i, column in enumerate(columns):
+        ys = np.linspace(1, 0, len(column) + 2)[1:-1]
+        for node, y in zip(column, ys):
+            pos[node] = (i / last, float(y))
+    return pos
+
+def plot_winner_net(config, genome, view=True, filename="winner_network", formats=None):
     """
     Visualiza a rede neural do genoma vencedor usando plotly.
     
@@ -18,64 +83,67 @@ def plot_winner_net(config, genome, view=True, filename="winner_network"):
         genome (neat.DefaultGenome): Genoma vencedor
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos (sem extensão)
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
     """
-    G = nx.DiGraph()
-    for key, conn in genome.connections.items():
-        if conn.enabled:
-            G.add_edge(key[0], key[1], weight=conn.weight)
-    for node in genome.nodes:
-        G.add_node(node)
-    pos = nx.spring_layout(G, seed=42)
-    edge_x = []
-    edge_y = []
-    edge_colors = []
-    for u, v, data in G.edges(data=True):
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-        color = 'green' if data['weight'] > 0 else 'red'
-        edge_colors.append(color)
+    structure = genome_structure(config, genome)
+    pos = layered_layout(structure)
+    connections = structure[3]
+    weights = np.array([genome.connections[key].weight for key in connections])
     fig = go.Figure()
-    for i in range(len(edge_colors)):
-        fig.add_trace(go.Scatter(
-            x=edge_x[i*3:i*3+2],
-            y=edge_y[i*3:i*3+2],
-            mode='lines',
-            line=dict(width=2, color=edge_colors[i]),
-            hoverinfo='none',
-            showlegend=False
-        ))
+    if connections:
+        xy = np.array([pos[u] + pos[v] for u, v in connections])
+        buckets = np.digitize(np.abs(weights), WEIGHT_BUCKETS)
+        for positive in (True, False):
+            for bucket, width in enumerate(BUCKET_WIDTHS):
+                mask = ((weights > 0) == positive) & (buckets == bucket)
+                if not mask.any():
+                    continue
+                # x0, x1, None por aresta em um único trace
+                edge_x = np.full((mask.sum(), 3), None, dtype=object)
+                edge_y = np.full((mask.sum(), 3), None, dtype=object)
+                edge_x[:, 0], edge_y[:, 0] = xy[mask, 0], xy[mask, 1]
+                edge_x[:, 1], edge_y[:, 1] = xy[mask, 2], xy[mask, 3]
+                fig.add_trace(go.Scatter(
+                    x=edge_x.ravel(),
+                    y=edge_y.ravel(),
+                    mode='lines',
+                    line=dict(width=width, color=EDGE_COLORS[positive]),
+                    hoverinfo='none',
+                    showlegend=False
+                ))
+    degree = dict.fromkeys(pos, 0)
+    for u, v in connections:
+        degree[u] += 1
+        degree[v] += 1
     node_x = []
     node_y = []
     node_text = []
     node_sizes = []
-    for node in G.nodes():
-        x, y = pos[node]
+    for node, (x, y) in pos.items():
         node_x.append(x)
         node_y.append(y)
         if node in genome.nodes:
             node_obj = genome.nodes[node]
-            tooltip = f"""
-            Node: {node}<br>
-            Bias: {getattr(node_obj, 'bias', 0.0):.3f}<br>
-            Response: {getattr(node_obj, 'response', 1.0):.3f}<br>
-            Activation: {getattr(node_obj, 'activation', 'sigmoid')}<br>
-            Aggregation: {getattr(node_obj, 'aggregation', 'sum')}
-            """
+            tooltip = (
+                f"Node: {node}<br>"
+                f"Bias: {getattr(node_obj, 'bias', 0.0):.3f}<br>"
+                f"Response: {getattr(node_obj, 'response', 1.0):.3f}<br>"
+                f"Activation: {getattr(node_obj, 'activation', 'sigmoid')}<br>"
+                f"Aggregation: {getattr(node_obj, 'aggregation', 'sum')}"
+            )
         else:
             tooltip = f"Node: {node}<br>(sem atributos do genoma)"
         node_text.append(tooltip)
-        node_sizes.append(10 + 5 * G.degree(node))
+        node_sizes.append(min(10 + 5 * degree[node], 40))
     fig.add_trace(
         go.Scatter(
             x=node_x, y=node_y,
-            mode='markers+text',
+            mode='markers',
             hoverinfo='text',
-            text=node_text,
+            hovertext=node_text,
             marker=dict(
                 showscale=False,
                 size=node_sizes,
@@ -92,10 +160,7 @@ def plot_winner_net(config, genome, view=True, filename="winner_network"):
         xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
         yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
     )
-    os.makedirs('neat/visualizations/output', exist_ok=True)
-    fig.write_html(f'neat/visualizations/output/{filename}.html')
-    fig.write_image(f'neat/visualizations/output/{filename}.png')
-    fig.write_image(f'neat/visualizations/output/{filename}.svg')
-    if view:
+    save_figure(fig, filename, formats)
+    if view and not is_headless():
         fig.show()
-    return fig 
\ No newline at end of file
+    return fig
\ No newline at end of file
@@ -14,8 +14,9 @@ from sklearn.metrics import (
     classification_report
 )
 import pandas as pd
+from .utils import save_figure, is_headless
 
-def plot_confusion_matrix(y_true, y_pred, view=True, filename="confusion_matrix"):
+def plot_confusion_matrix(y_true, y_pred, view=True, filename="confusion_matrix", formats=None):
     """
     Plota a matriz de confusão.
     
@@ -24,6 +25,7 @@ def plot_confusion_matrix(y_true, y_pred, view=True, filename="confusion_matrix"
         y_pred (array-like): Valores preditos
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
@@ -41,14 +43,12 @@ def plot_confusion_matrix(y_true, y_pred, view=True, filename="confusion_matrix"
         xaxis_title="Predito",
         yaxis_title="Real"
     )
-    fig.write_html(f'neat/visualizations/output/{filename}.html')
-    fig.write_image(f'neat/visualizations/output/{filename}.png')
-    fig.write_image(f'neat/visualizations/output/{filename}.svg')
-    if view:
+    save_figure(fig, filename, formats)
+    if view and not is_headless():
         fig.show()
     return fig
 
-def plot_roc_curve(y_true, y_score, view=True, filename="roc_curve"):
+def plot_roc_curve(y_true, y_score, view=True, filename="roc_curve", formats=None):
     """
     Plota a curva ROC.
     
@@ -57,6 +57,7 @@ def plot_roc_curve(y_true, y_score, view=True, filename="roc_curve"):
         y_score (array-like): Scores de probabilidade
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
@@ -93,17 +94,14 @@ def plot_roc_curve(y_true, y_score, view=True, filename="roc_curve"):
     )
     
     # Salvar figuras
-    os.makedirs('neat/visualizations/output', exist_ok=True)
-    fig.write_html(f'neat/visualizations/output/{filename}.html')
-    fig.write_image(f'neat/visualizations/output/{filename}.png')
-    fig.write_image(f'neat/visualizations/output/{filename}.svg')
+    save_figure(fig, filename, formats)
     
-    if view:
+    if view and not is_headless():
         fig.show()
     
     return fig
 
-def plot_precision_recall(y_true, y_score, view=True, filename="precision_recall"):
+def plot_precision_recall(y_true, y_score, view=True, filename="precision_recall", formats=None):
     """
     Plota a curva Precision-Recall.
     
@@ -112,6 +110,7 @@ def plot_precision_recall(y_true, y_score, view=True, filename="precision_recall
         y_score (array-like): Scores de probabilidade
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
@@ -140,12 +139,9 @@ def plot_precision_recall(y_true, y_score, view=True, filename="precision_recall
     )
     
     # Salvar figuras
-    os.makedirs('neat/visualizations/output', exist_ok=True)
-    fig.write_html(f'neat/visualizations/output/{filename}.html')
-    fig.write_image(f'neat/visualizations/output/{filename}.png')
-    fig.write_image(f'neat/visualizations/output/{filename}.svg')
+    save_figure(fig, filename, formats)
     
-    if view:
+    if view and not is_headless():
         fig.show()
     
     return fig
@@ -0,0 +1,98 @@
+"""
+Geração de relatórios em segundo plano.
+
+Os gráficos de fim de treino são renderizados em um pool de processos
+(kaleido incluído), sem ``fig.show()``: cada chamada retorna um ``Future`` e o
+treinamento segue (ou termina) sem esperar pelas imagens.
+"""
+
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+from .utils import DEFAULT_FORMATS
+
+
+def _render(name, args, kwargs):
+    # Importa só o submódulo da função pedida, dentro do worker
+    package = importlib.import_module(__package__)
+    getattr(package, name)(*args, **kwargs)
+    return name
+
+
+def _report(y_true, y_pred):
+    from .performance_visualization import generate_classification_report
+    return generate_classification_report(y_true, y_pred)
+
+
+class ReportPipeline(object):
+    """
+    Pool de renderização de gráficos.
+
+    Args:
+        workers (int): Processos de renderização
+        formats (iterable, optional): Formatos salvos por gráfico (padrão:
+            html, png e svg); ``['html']`` evita o kaleido
+    """
+
+    def __init__(self, workers=2, formats=None):
+        self.formats = tuple(DEFAULT_FORMATS if formats is None else formats)
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.futures = {}
+
+    def submit(self, name, *args, **kwargs):
+        """
+        Agenda ``visualizations.<name>(*args, **kwargs)`` com ``view=False``.
+
+        Returns:
+            concurrent.futures.Future: Resolve para ``name`` quando os arquivos
+            estiverem gravados
+        """
+        kwargs.setdefault('view', False)
+        kwargs.setdefault('formats', self.formats)
+        future = self.executor.submit(_render, name, args, kwargs)
+        self.futures[name] = future
+        return future
+
+    def submit_training_reports(self, config, winner, stats, y_test, predictions, scores, descriptors=None):
+        """
+        Agenda os gráficos e o relatório de classificação de fim de treino.
+
+        ``descriptors`` (DataFrame de ``DescriptorReporter.to_frame()``), se
+        dado, estende o embedding de genótipos a todos os genomas avaliados.
+
+        Returns:
+            dict: ``{nome: Future}``; o Future de
+            ``generate_classification_report`` resolve para o texto do relatório
+        """
+        self.submit('plot_winner_net', config, winner)
+        self.submit('plot_fitness_history', stats)
+        self.submit('plot_species_evolution', stats)
+        self.submit('plot_genotype_embedding', stats, descriptors=descriptors)
+        self.submit('plot_confusion_matrix', y_test, predictions)
+        self.submit('plot_roc_curve', y_test, scores)
+        self.submit('plot_precision_recall', y_test, scores)
+        self.futures['generate_classification_report'] = self.executor.submit(_report, y_test, predictions)
+        return dict(self.futures)
+
+    def wait(self):
+        """
+        Espera todos os relatórios agendados.
+
+        Returns:
+            dict: ``{nome: exceção}`` dos que falharam
+        """
+        errors = {}
+        for name, future in self.futures.items():
+            exc = future.exception()
+            if exc is not None:
+                errors[name] = exc
+        return errors
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -5,14 +5,82 @@ Módulo para visualização espacial e meteorológica.
 import os
 import numpy as np
 import pandas as pd
-import folium
-from folium.plugins import MarkerCluster
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from .utils import save_figure, is_headless
 
-def plot_airport_ga_map(airports_df, view=True, filename="airport_ga_map"):
+# Marcador de cada linha [lat, lon, raio, cor, popup] do FastMarkerCluster
+_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: row[2], color: row[3], fillColor: row[3], fill: true, fillOpacity: 0.7
+    });
+    marker.bindPopup(row[4]);
+    return marker;
+}
+"""
+
+# Título e unidade de cada variável meteorológica conhecida (nomes antigos e
+# os de SELECTED_COLUMNS)
+WEATHER_COLUMNS = {
+    'visibility': ('Visibilidade', 'm'),
+    'wind_speed': ('Velocidade do Vento', 'kt'),
+    'wind_direction': ('Direção do Vento', '°'),
+    'precipitation': ('Precipitação', 'mm'),
+    'visibility_m': ('Visibilidade', 'm'),
+    'wind_speed_knts': ('Velocidade do Vento', 'kt'),
+    'wind_dir_deg': ('Direção do Vento', '°'),
+    'temperature_deg': ('Temperatura', '°C'),
+    'press_p': ('Pressão', 'hPa')
+}
+MAX_POINTS = 2000
+
+def _ga_labels(series):
+    """Rótulos de GA (0/1, bool ou "true"/"false") como float64."""
+    if not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)):
+        series = series.astype(str).str.lower().eq('true')
+    return series.to_numpy(dtype=np.float64)
+
+def aggregate_airports(records, airport_col='airport', label_col='has_ga', lat_col='lat',
+                       lon_col='lon', continent_col='continent'):
+    """
+    Agrega registros brutos (uma linha por aproximação) por aeroporto.
+
+    Args:
+        records (pandas.DataFrame): Registros com aeroporto, rótulo de GA
+            (0/1, bool ou "true"/"false"), latitude, longitude e, opcionalmente,
+            continente
+        airport_col, label_col, lat_col, lon_col, continent_col (str): Nomes
+            das colunas em ``records``
+
+    Returns:
+        pandas.DataFrame: Colunas icao, lat, lon, ga_rate, n_landings e continent
+            (``'-'`` se ``continent_col`` não existir)
+    """
+    frame = pd.DataFrame({
+        'icao': records[airport_col].to_numpy(),
+        'lat': records[lat_col].to_numpy(),
+        'lon': records[lon_col].to_numpy(),
+        'ga': _ga_labels(records[label_col]),
+        'continent': records[continent_col].to_numpy() if continent_col in records else '-'
+    })
+    airports = frame.groupby('icao', sort=False, observed=True).agg(
+        lat=('lat', 'first'),
+        lon=('lon', 'first'),
+        ga_rate=('ga', 'mean'),
+        n_landings=('ga', 'size'),
+        continent=('continent', 'first')
+    )
+    return airports.reset_index()
+
+def plot_airport_ga_map(airports_df=None, view=True, filename="airport_ga_map", records=None, **columns):
     """
     Plota um mapa interativo dos aeroportos com taxas de Go-Around.
+
+    Cores, raios e popups são calculados de forma vetorizada e cada continente
+    vira uma camada ``FastMarkerCluster``: os marcadores são criados no
+    navegador a partir de um único array, o que mantém o HTML leve mesmo com
+    milhares de aeroportos.
     
     Args:
         airports_df (pandas.DataFrame): DataFrame com colunas:
@@ -24,52 +92,51 @@ def plot_airport_ga_map(airports_df, view=True, filename="airport_ga_map"):
             - continent: continente
         view (bool): Se True, exibe o mapa interativamente
         filename (str): Nome base para salvar os arquivos
+        records (pandas.DataFrame, optional): Registros por aproximação, usados
+            no lugar de ``airports_df`` (agregados por ``aggregate_airports``)
+        **columns: Nomes de colunas repassados a ``aggregate_airports``
     
     Returns:
         folium.Map: Mapa interativo
     """
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    if records is not None:
+        airports_df = aggregate_airports(records, **columns)
+
+    lat = airports_df['lat'].to_numpy(dtype=float)
+    lon = airports_df['lon'].to_numpy(dtype=float)
+    ga_rate = airports_df['ga_rate'].to_numpy(dtype=float)
+    n_landings = airports_df['n_landings'].to_numpy()
+    continent = (airports_df['continent'] if 'continent' in airports_df
+                 else pd.Series('-', index=airports_df.index)).astype(str)
+
+    # Cor pela taxa de GA e raio pelo número de pousos
+    red = (255 * ga_rate).astype(int).astype(str)
+    green = (255 * (1 - ga_rate)).astype(int).astype(str)
+    color = 'rgb(' + pd.Series(red) + ', ' + pd.Series(green) + ', 0)'
+    radius = np.round(5 + 15 * n_landings / max(n_landings.max(), 1), 1)
+    popup = ('<b>Aeroporto:</b> ' + airports_df['icao'].astype(str).to_numpy()
+             + '<br><b>Taxa de GA:</b> ' + pd.Series(ga_rate).map('{:.2%}'.format).to_numpy()
+             + '<br><b>Pousos:</b> ' + n_landings.astype(str)
+             + '<br><b>Continente:</b> ' + continent.to_numpy())
+
+    markers = pd.DataFrame({
+        'lat': np.round(lat, 5), 'lon': np.round(lon, 5), 'radius': radius,
+        'color': color.to_numpy(), 'popup': popup, 'continent': continent.to_numpy()
+    })
+
     # Criar mapa base
-    m = folium.Map(
-        location=[airports_df['lat'].mean(), airports_df['lon'].mean()],
-        zoom_start=4
-    )
-    
-    # Criar clusters por continente
-    clusters = {}
-    for continent in airports_df['continent'].unique():
-        clusters[continent] = MarkerCluster(name=continent)
-    
-    # Adicionar marcadores
-    for _, row in airports_df.iterrows():
-        # Calcular cor baseada na taxa de GA
-        ga_rate = row['ga_rate']
-        color = f'rgb({int(255 * ga_rate)}, {int(255 * (1 - ga_rate))}, 0)'
-        
-        # Calcular tamanho baseado no número de pousos
-        size = 5 + 15 * (row['n_landings'] / airports_df['n_landings'].max())
-        
-        # Criar popup
-        popup = f"""
-        <b>Aeroporto:</b> {row['icao']}<br>
-        <b>Taxa de GA:</b> {ga_rate:.2%}<br>
-        <b>Pousos:</b> {row['n_landings']}<br>
-        <b>Continente:</b> {row['continent']}
-        """
-        
-        # Adicionar marcador ao cluster apropriado
-        folium.CircleMarker(
-            location=[row['lat'], row['lon']],
-            radius=size,
-            popup=popup,
-            color=color,
-            fill=True,
-            fill_color=color,
-            fill_opacity=0.7
-        ).add_to(clusters[row['continent']])
-    
-    # Adicionar clusters ao mapa
-    for cluster in clusters.values():
-        cluster.add_to(m)
+    m = folium.Map(location=[np.mean(lat), np.mean(lon)], zoom_start=4)
+
+    # Uma camada de clusters por continente
+    for name, group in markers.groupby('continent', sort=False):
+        FastMarkerCluster(
+            group[['lat', 'lon', 'radius', 'color', 'popup']].values.tolist(),
+            callback=_MARKER_CALLBACK,
+            name=name
+        ).add_to(m)
     
     # Adicionar controle de camadas
     folium.LayerControl().add_to(m)
@@ -78,15 +145,75 @@ def plot_airport_ga_map(airports_df, view=True, filename="airport_ga_map"):
     os.makedirs('neat/visualizations/output', exist_ok=True)
     m.save(f'neat/visualizations/output/{filename}.html')
     
-    if view:
+    if view and not is_headless():
         import webbrowser
         webbrowser.open(f'neat/visualizations/output/{filename}.html')
     
     return m
 
-def plot_weather_vs_ga(weather_df, view=True, filename="weather_vs_ga"):
+def _default_label(weather_df):
+    return 'ga_occurred' if 'ga_occurred' in weather_df else 'has_ga'
+
+def _default_columns(weather_df):
+    return [c for c in WEATHER_COLUMNS if c in weather_df]
+
+def weather_summary(weather_df, columns=None, label_col=None, bins=30):
+    """
+    Resume cada variável meteorológica por classe de GA com NumPy.
+
+    Args:
+        weather_df (pandas.DataFrame): Observações, uma linha por aproximação
+        columns (list, optional): Variáveis (padrão: as de WEATHER_COLUMNS
+            presentes em ``weather_df``)
+        label_col (str, optional): Coluna de GA (padrão: ``ga_occurred`` ou
+            ``has_ga``)
+        bins (int): Número de faixas dos histogramas
+
+    Returns:
+        dict: {coluna: {'box': {classe: quartis, cercas, média e n},
+            'edges', 'counts', 'ga_counts', 'ga_rate'}}; valores não finitos
+            são ignorados
+    """
+    label_col = label_col or _default_label(weather_df)
+    columns = columns or _default_columns(weather_df)
+    label = _ga_labels(weather_df[label_col])
+    summary = {}
+    for column in columns:
+        values = weather_df[column].to_numpy(dtype=np.float64)
+        finite = np.isfinite(values)
+        values, ga = values[finite], label[finite]
+        box = {}
+        for cls in (0, 1):
+            v = values[ga == cls]
+            if not len(v):
+                continue
+            q1, median, q3 = np.quantile(v, [0.25, 0.5, 0.75])
+            iqr = q3 - q1
+            box[cls] = {
+                'q1': float(q1), 'median': float(median), 'q3': float(q3),
+                'mean': float(v.mean()), 'n': len(v),
+                'lowerfence': float(v[v >= q1 - 1.5 * iqr].min()),
+                'upperfence': float(v[v <= q3 + 1.5 * iqr].max())
+            }
+        edges = np.histogram_bin_edges(values, bins) if len(values) else np.linspace(0, 1, bins + 1)
+        counts, _ = np.histogram(values, edges)
+        ga_counts, _ = np.histogram(values, edges, weights=ga)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ga_rate = np.where(counts > 0, ga_counts / counts, np.nan)
+        summary[column] = {'box': box, 'edges': edges, 'counts': counts,
+                           'ga_counts': ga_counts, 'ga_rate': ga_rate}
+    return summary
+
+def plot_weather_vs_ga(weather_df, view=True, filename="weather_vs_ga", formats=None, summary=True,
+                       columns=None, label_col=None, bins=30, max_points=MAX_POINTS, seed=0):
     """
     Plota análise de condições meteorológicas vs Go-Around.
+
+    No modo resumo (padrão) só agregados entram na figura: boxplots com
+    quartis pré-calculados, histograma por faixa e taxa de GA por faixa (eixo
+    secundário), calculados por ``weather_summary``. Observações brutas
+    aparecem apenas numa amostra de até ``max_points`` linhas; o tamanho da
+    figura não depende do número de aproximações.
     
     Args:
         weather_df (pandas.DataFrame): DataFrame com colunas:
@@ -95,100 +222,151 @@ def plot_weather_vs_ga(weather_df, view=True, filename="weather_vs_ga"):
             - wind_direction: direção do vento
             - precipitation: precipitação
             - ga_occurred: ocorrência de GA (0/1)
+            ou os nomes de SELECTED_COLUMNS (``visibility_m``,
+            ``wind_speed_knts``, ...) com ``has_ga``
         view (bool): Se True, exibe o gráfico interativamente
         filename (str): Nome base para salvar os arquivos
+        formats (iterable, optional): Formatos salvos (padrão: html, png e svg)
+        summary (bool): Se False, usa boxplots com todos os pontos (só para
+            conjuntos pequenos)
+        columns (list, optional): Variáveis plotadas (padrão: as de
+            WEATHER_COLUMNS presentes em ``weather_df``)
+        label_col (str, optional): Coluna de GA (padrão: ``ga_occurred`` ou
+            ``has_ga``)
+        bins (int): Faixas dos histogramas
+        max_points (int): Máximo de observações brutas sobrepostas (0 desliga)
+        seed (int): Semente da amostra
     
     Returns:
         plotly.graph_objects.Figure: Figura do plotly
     """
-    # Criar figura com subplots
+    label_col = label_col or _default_label(weather_df)
+    columns = columns or _default_columns(weather_df)
+    if not summary:
+        return _plot_weather_points(weather_df, columns, label_col, view, filename, formats)
+
+    stats = weather_summary(weather_df, columns, label_col, bins)
+    titles = []
+    for column in columns:
+        name = WEATHER_COLUMNS.get(column, (column, ''))[0]
+        titles += [f'{name} vs GA', f'{name}: distribuição e taxa de GA']
     fig = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=(
-            'Visibilidade vs GA',
-            'Velocidade do Vento vs GA',
-            'Direção do Vento vs GA',
-            'Precipitação vs GA'
-        )
-    )
-    
-    # Plotar visibilidade
-    fig.add_trace(
-        go.Box(
-            x=weather_df['ga_occurred'],
-            y=weather_df['visibility'],
-            name='Visibilidade',
-            boxpoints='all',
-            jitter=0.3,
-            pointpos=-1.8
-        ),
-        row=1, col=1
-    )
-    
-    # Plotar velocidade do vento
-    fig.add_trace(
-        go.Box(
-            x=weather_df['ga_occurred'],
-            y=weather_df['wind_speed'],
-            name='Velocidade do Vento',
-            boxpoints='all',
-            jitter=0.3,
-            pointpos=-1.8
-        ),
-        row=1, col=2
+        rows=len(columns), cols=2,
+        subplot_titles=titles,
+        specs=[[{}, {'secondary_y': True}] for _ in columns]
     )
-    
-    # Plotar direção do vento
-    fig.add_trace(
-        go.Box(
-            x=weather_df['ga_occurred'],
-            y=weather_df['wind_direction'],
-            name='Direção do Vento',
-            boxpoints='all',
-            jitter=0.3,
-            pointpos=-1.8
-        ),
-        row=2, col=1
-    )
-    
-    # Plotar precipitação
-    fig.add_trace(
-        go.Box(
-            x=weather_df['ga_occurred'],
-            y=weather_df['precipitation'],
-            name='Precipitação',
-            boxpoints='all',
-            jitter=0.3,
-            pointpos=-1.8
-        ),
-        row=2, col=2
+
+    sample = None
+    if max_points and len(weather_df) > 0:
+        n = min(max_points, len(weather_df))
+        rows = np.random.default_rng(seed).choice(len(weather_df), n, replace=False)
+        sample = weather_df.iloc[np.sort(rows)]
+        sample_ga = _ga_labels(sample[label_col])
+        jitter = np.random.default_rng(seed).uniform(-0.3, 0.3, n)
+
+    for row, column in enumerate(columns, start=1):
+        name, unit = WEATHER_COLUMNS.get(column, (column, ''))
+        summary_col = stats[column]
+        box = summary_col['box']
+        classes = sorted(box)
+
+        # Boxplot pré-calculado por classe
+        fig.add_trace(
+            go.Box(
+                x=classes,
+                q1=[box[c]['q1'] for c in classes],
+                median=[box[c]['median'] for c in classes],
+                q3=[box[c]['q3'] for c in classes],
+                mean=[box[c]['mean'] for c in classes],
+                lowerfence=[box[c]['lowerfence'] for c in classes],
+                upperfence=[box[c]['upperfence'] for c in classes],
+                name=name,
+                boxpoints=False
+            ),
+            row=row, col=1
+        )
+        if sample is not None:
+            fig.add_trace(
+                go.Scatter(
+                    x=sample_ga + jitter,
+                    y=sample[column],
+                    mode='markers',
+                    marker=dict(size=3, opacity=0.4),
+                    name=f'{name} (amostra)',
+                    hoverinfo='y'
+                ),
+                row=row, col=1
+            )
+
+        # Histograma e taxa de GA por faixa
+        edges = summary_col['edges']
+        centers = (edges[:-1] + edges[1:]) / 2
+        fig.add_trace(
+            go.Bar(x=centers, y=summary_col['counts'], width=np.diff(edges),
+                   name=f'{name} (contagem)', marker_color='lightsteelblue'),
+            row=row, col=2, secondary_y=False
+        )
+        fig.add_trace(
+            go.Scatter(x=centers, y=summary_col['ga_rate'], mode='lines+markers',
+                       name=f'{name} (taxa de GA)', line=dict(color='crimson')),
+            row=row, col=2, secondary_y=True
+        )
+
+        label = f'{name} ({unit})' if unit else name
+        fig.update_xaxes(title_text='Go-Around Ocorreu', tickvals=[0, 1], row=row, col=1)
+        fig.update_yaxes(title_text=label, row=row, col=1)
+        fig.update_xaxes(title_text=label, row=row, col=2)
+        fig.update_yaxes(title_text='Aproximações', row=row, col=2, secondary_y=False)
+        fig.update_yaxes(title_text='Taxa de GA', tickformat='.0%', row=row, col=2, secondary_y=True)
+
+    fig.update_layout(
+        title_text='Análise de Condições Meteorológicas vs Go-Around',
+        height=350 * len(columns),
+        showlegend=False
     )
-    
-    # Atualizar layout
+
+    # Salvar figuras
+    save_figure(fig, filename, formats)
+
+    if view and not is_headless():
+        fig.show()
+
+    return fig
+
+def _plot_weather_points(weather_df, columns, label_col, view, filename, formats):
+    """Boxplots com todas as observações (``boxpoints='all'``)."""
+    cols = 2
+    rows = -(-len(columns) // cols)
+    names = [WEATHER_COLUMNS.get(c, (c, ''))[0] for c in columns]
+    fig = make_subplots(rows=rows, cols=cols, subplot_titles=[f'{n} vs GA' for n in names])
+    label = _ga_labels(weather_df[label_col])
+    for i, (column, name) in enumerate(zip(columns, names)):
+        row, col = i // cols + 1, i % cols + 1
+        fig.add_trace(
+            go.Box(
+                x=label,
+                y=weather_df[column],
+                name=name,
+                boxpoints='all',
+                jitter=0.3,
+                pointpos=-1.8
+            ),
+            row=row, col=col
+        )
+        unit = WEATHER_COLUMNS.get(column, (column, ''))[1]
+        fig.update_xaxes(title_text='Go-Around Ocorreu', row=row, col=col)
+        fig.update_yaxes(title_text=f'{name} ({unit})' if unit else name, row=row, col=col)
+
     fig.update_layout(
         title_text='Análise de Condições Meteorológicas vs Go-Around',
-        height=800,
+        height=400 * rows,
         showlegend=False
     )
-    
-    # Atualizar eixos
-    fig.update_xaxes(title_text='Go-Around Ocorreu', row=1, col=1)
-    fig.update_xaxes(title_text='Go-Around Ocorreu', row=1, col=2)
-    fig.update_xaxes(title_text='Go-Around Ocorreu', row=2, col=1)
-    fig.update_xaxes(title_text='Go-Around Ocorreu', row=2, col=2)
-    
-    fig.update_yaxes(title_text='Visibilidade (m)', row=1, col=1)
-    fig.update_yaxes(title_text='Velocidade do Vento (kt)', row=1, col=2)
-    fig.update_yaxes(title_text='Direção do Vento (°)', row=2, col=1)
-    fig.update_yaxes(title_text='Precipitação (mm)', row=2, col=2)
-    
+
     # Salvar figuras
-    os.makedirs('neat/visualizations/output', exist_ok=True)
-    fig.write_html(f'neat/visualizations/output/{filename}.html')
-    fig.write_image(f'neat/visualizations/output/{filename}.png')
-    fig.write_image(f'neat/visualizations/output/{filename}.svg')
+    save_figure(fig, filename, formats)
     
-    if view:
+    if view and not is_headless():
         fig.show()
     
-    return fig 
\ No newline at end of file
+    return fig
@@ -1,15 +1,72 @@
 import os
+import sys
 import json
 import pandas as pd
 from datetime import datetime
 import numpy as np
 
-def export_training_log(stats, config, filename=None):
+OUTPUT_DIR = 'neat/visualizations/output'
+DEFAULT_FORMATS = ('html', 'png', 'svg')
+
+def is_headless():
+    """
+    Indica se não há como exibir gráficos (``fig.show()`` bloquearia ou falharia).
+
+    Verdadeiro se ``NOS_HEADLESS`` estiver definida ou, no Linux, sem
+    ``DISPLAY``/``WAYLAND_DISPLAY``.
+    """
+    if os.environ.get('NOS_HEADLESS'):
+        return True
+    return sys.platform.startswith('linux') and not (
+        os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+def save_figure(fig, filename, formats=None):
+    """
+    Salva uma figura plotly em ``OUTPUT_DIR`` nos formatos pedidos.
+
+    Args:
+        fig (plotly.graph_objects.Figure): Figura
+        filename (str): Nome base (sem extensão)
+        formats (iterable, optional): Subconjunto de html, png, svg, pdf,
+            jpeg e webp (padrão: DEFAULT_FORMATS)
+
+    Returns:
+        list: Caminhos gravados
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    paths = []
+    for fmt in (DEFAULT_FORMATS if formats is None else formats):
+        path = f'{OUTPUT_DIR}/{filename}.{fmt}'
+        if fmt == 'html':
+            fig.write_html(path)
+        else:
+            fig.write_image(path)
+        paths.append(path)
+    return paths
+
+def fitness_extremes(stats):
+    """
+    Fitness máximo e mínimo por geração.
+
+    Usa ``get_fitness_max``/``get_fitness_min`` do ``CompactStatisticsReporter``
+    ou, no ``neat.StatisticsReporter``, os valores individuais.
+
+    Returns:
+        tuple: (lista de máximos, lista de mínimos)
+    """
+    if hasattr(stats, 'get_fitness_max'):
+        return stats.get_fitness_max(), stats.get_fitness_min()
+    scores = stats.get_fitness_stat(lambda x: x)
+    return ([max(s) if s else 0 for s in scores], [min(s) if s else 0 for s in scores])
+
+def export_training_log(stats, config, filename=None, profile=None):
     if filename is None:
         filename = f"training_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     os.makedirs('neat/visualizations/output', exist_ok=True)
-    fitness_stats = stats.get_fitness_stat(lambda x: x)
-    generations = range(len(fitness_stats))
+    fitness_mean = stats.get_fitness_mean()
+    fitness_std = stats.get_fitness_stdev()
+    fitness_max, _ = fitness_extremes(stats)
+    generations = range(len(fitness_mean))
     species_sizes = stats.get_species_sizes()
     json_data = {
         'config': {
@@ -24,17 +81,11 @@ def export_training_log(stats, config, filename=None):
         'generations': []
     }
     csv_data = []
+    profile_by_gen = {record['generation']: record for record in (profile or [])}
     for gen in generations:
-        fitness_values = fitness_stats[gen]
-        if hasattr(fitness_values, '__iter__') and len(fitness_values) > 0:
-            fitness_array = np.array(list(fitness_values))
-            best_fitness = float(np.max(fitness_array))
-            avg_fitness = float(np.mean(fitness_array))
-            std_fitness = float(np.std(fitness_array))
-        else:
-            best_fitness = float(fitness_values) if fitness_values is not None else 0.0
-            avg_fitness = best_fitness
-            std_fitness = 0.0
+        best_fitness = float(fitness_max[gen])
+        avg_fitness = float(fitness_mean[gen])
+        std_fitness = float(fitness_std[gen])
         gen_data = {
             'generation': gen,
             'best_fitness': best_fitness,
@@ -43,6 +94,8 @@ def export_training_log(stats, config, filename=None):
             'num_species': len(species_sizes[gen]) if gen < len(species_sizes) else 0,
             'avg_species_size': np.mean(species_sizes[gen]) if gen < len(species_sizes) and species_sizes[gen] else 0
         }
+        if gen in profile_by_gen:
+            gen_data.update({k: v for k, v in profile_by_gen[gen].items() if k != 'generation'})
         json_data['generations'].append(gen_data)
         csv_data.append(gen_data)
     json_path = f'neat/visualizations/output/{filename}.json'
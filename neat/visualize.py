@@ -9,8 +9,13 @@ os.makedirs("neat/visualizations", exist_ok=True)
 
 def plot_stats(statistics, ylog=False, view=False, filename="neat/visualizations/fitness.svg"):
     """ Plota a curva de fitness ao longo das gerações """
-    generation = range(len(statistics.most_fit_genomes))
-    best_fitness = [g.fitness for g in statistics.most_fit_genomes]
+    if hasattr(statistics, 'get_fitness_max'):
+        # CompactStatisticsReporter: máximo de todas as gerações, sem ler genomas
+        best_fitness = statistics.get_fitness_max()
+        generation = range(len(best_fitness))
+    else:
+        generation = range(len(statistics.most_fit_genomes))
+        best_fitness = [g.fitness for g in statistics.most_fit_genomes]
 
     plt.figure()
     plt.plot(generation, best_fitness, "b-", label="Melhor Fitness")
@@ -0,0 +1,177 @@
+"""
+Cache incremental de features indexado pelo conteúdo do CSV de entrada.
+
+A chave do cache combina o caminho do CSV e a receita de pré-processamento
+(SELECTED_COLUMNS, política de dropna e mapeamento de rótulos); em cada
+entrada, o manifesto guarda tamanho, mtime e o hash dos bytes já
+processados. Se tamanho e mtime não mudaram, X/y são lidos direto do cache
+sem ler o CSV; se o arquivo apenas cresceu (novos dias anexados ao final), o
+prefixo é conferido pelo hash e somente as linhas novas são processadas e
+concatenadas aos arrays em cache.
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from feature_engineering import (
+    SELECTED_COLUMNS,
+    LABEL_COLUMN,
+    POSITIVE_LABEL,
+    DROPNA_COLUMNS,
+    CHUNKSIZE,
+    extract_xy
+)
+
+CACHE_DIR = "data/cache"
+MANIFEST_FILE = "manifest.json"
+HASH_BLOCK = 8 << 20
+
+def recipe_key(input_path):
+    """Hash do CSV de origem (caminho resolvido) e da receita de pré-processamento."""
+    recipe = {
+        'input': os.path.realpath(input_path),
+        'columns': SELECTED_COLUMNS,
+        'dropna': DROPNA_COLUMNS,
+        'label': {'column': LABEL_COLUMN, 'positive': POSITIVE_LABEL}
+    }
+    return hashlib.sha256(json.dumps(recipe, sort_keys=True).encode()).hexdigest()[:16]
+
+def _hash_range(h, path, start, end):
+    """Acrescenta ao hash ``h`` os bytes ``[start, end)`` de ``path``; retorna a posição final."""
+    remaining = end - start
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while remaining > 0:
+            block = f.read(min(HASH_BLOCK, remaining))
+            if not block:
+                break
+            h.update(block)
+            remaining -= len(block)
+    return end - remaining
+
+def _ends_with_newline(path, size):
+    if size == 0:
+        return True
+    with open(path, 'rb') as f:
+        f.seek(size - 1)
+        return f.read(1) == b'\n'
+
+def _extract_range(path, offset):
+    """Processa as linhas do CSV a partir de ``offset`` (em bytes), em blocos."""
+    names = list(pd.read_csv(path, nrows=0).columns)
+    xs, ys = [], []
+    with open(path, 'rb') as f:
+        if offset:
+            f.seek(offset)
+            reader = pd.read_csv(f, header=None, names=names, usecols=DROPNA_COLUMNS, chunksize=CHUNKSIZE)
+        else:
+            reader = pd.read_csv(f, usecols=DROPNA_COLUMNS, chunksize=CHUNKSIZE)
+        for chunk in reader:
+            X, y = extract_xy(chunk)
+            xs.append(X)
+            ys.append(y)
+    if not xs:
+        return np.empty((0, len(SELECTED_COLUMNS))), np.empty((0,), dtype=np.int64)
+    return np.concatenate(xs), np.concatenate(ys)
+
+def _write_npy(path, *parts):
+    """Grava a concatenação de ``parts`` em ``path`` de forma atômica via memmap."""
+    n = sum(len(p) for p in parts)
+    tmp = path + '.tmp'
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=parts[-1].dtype, shape=(n,) + parts[-1].shape[1:])
+    start = 0
+    for p in parts:
+        out[start:start + len(p)] = p
+        start += len(p)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+
+def _write_manifest(manifest_path, manifest):
+    tmp = manifest_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+
+def _read_manifest(manifest_path, x_path, y_path):
+    """
+    Manifesto da entrada, ou None se ausente ou inconsistente com X/y.
+
+    X.npy e y.npy são substituídos um de cada vez e o manifesto por último;
+    após uma interrupção entre essas trocas, os tamanhos não batem e a
+    entrada é reconstruída em vez de estendida.
+    """
+    if not os.path.isfile(manifest_path):
+        return None
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        x_rows = len(np.load(x_path, mmap_mode='r'))
+        y_rows = len(np.load(y_path, mmap_mode='r'))
+    except (OSError, ValueError):
+        return None
+    if not x_rows == y_rows == manifest.get('rows'):
+        return None
+    return manifest
+
+def cached_xy(input_path, cache_dir=CACHE_DIR):
+    """
+    Retorna X/y do CSV, reaproveitando e estendendo o cache quando possível.
+
+    Args:
+        input_path (str): CSV de origem
+        cache_dir (str): Diretório raiz do cache
+
+    Returns:
+        tuple: (X, y) como arrays NumPy
+    """
+    entry = os.path.join(cache_dir, recipe_key(input_path))
+    x_path = os.path.join(entry, 'X.npy')
+    y_path = os.path.join(entry, 'y.npy')
+    manifest_path = os.path.join(entry, MANIFEST_FILE)
+    stat = os.stat(input_path)
+    size = stat.st_size
+
+    manifest = _read_manifest(manifest_path, x_path, y_path)
+    if manifest and manifest['size'] == size and manifest.get('mtime') == stat.st_mtime:
+        return np.load(x_path), np.load(y_path)
+
+    # O hash do prefixo antigo continua com os bytes novos: o arquivo é lido uma vez
+    h = hashlib.blake2b(digest_size=32)
+    hashed = 0
+    offset = 0
+    if manifest and manifest['size'] <= size:
+        hashed = _hash_range(h, input_path, 0, manifest['size'])
+        if h.hexdigest() == manifest['prefix_hash']:
+            if manifest['size'] == size:
+                # Só o mtime mudou: o conteúdo é o mesmo
+                _write_manifest(manifest_path, dict(manifest, mtime=stat.st_mtime))
+                return np.load(x_path), np.load(y_path)
+            if manifest['appendable']:
+                offset = manifest['size']
+    _hash_range(h, input_path, hashed, size)
+
+    os.makedirs(entry, exist_ok=True)
+    X_new, y_new = _extract_range(input_path, offset)
+    if offset:
+        X_old = np.load(x_path, mmap_mode='r')
+        y_old = np.load(y_path, mmap_mode='r')
+        _write_npy(x_path, X_old, X_new)
+        _write_npy(y_path, y_old, y_new)
+        del X_old, y_old
+    else:
+        _write_npy(x_path, X_new)
+        _write_npy(y_path, y_new)
+
+    _write_manifest(manifest_path, {
+        'source': input_path,
+        'size': size,
+        'mtime': stat.st_mtime,
+        'prefix_hash': h.hexdigest(),
+        'appendable': _ends_with_newline(input_path, size),
+        'rows': int(len(np.load(y_path, mmap_mode='r')))
+    })
+    return np.load(x_path), np.load(y_path)
@@ -1,10 +1,14 @@
 import pandas as pd
 import numpy as np
 import os
+import json
+import hashlib
+import argparse
 
 INPUT_PATH = "data/go_arounds_augmented.csv"
 X_OUTPUT_PATH = "data/X.npy"
 Y_OUTPUT_PATH = "data/y.npy"
+CHUNKSIZE = 500_000
 
 SELECTED_COLUMNS = [
     "wind_speed_knts",
@@ -16,14 +20,130 @@ SELECTED_COLUMNS = [
     "glide_slope_angle",
     "n_approaches"
 ]
+LABEL_COLUMN = "has_ga"
+POSITIVE_LABEL = "true"
+DROPNA_COLUMNS = SELECTED_COLUMNS + [LABEL_COLUMN]
 
-def main():
-    df = pd.read_csv(INPUT_PATH, low_memory=False)
-    df = df.dropna(subset=SELECTED_COLUMNS + ['has_ga'])
+def columns_hash(columns=SELECTED_COLUMNS):
+    """Hash estável da lista (ordenada) de colunas de features."""
+    return hashlib.sha256(json.dumps(list(columns)).encode()).hexdigest()
+
+def _label(series):
+    return series.astype(str).str.lower().eq(POSITIVE_LABEL).to_numpy(dtype=np.int8)
+
+def extract_xy(df):
+    """Aplica a política de dropna e o mapeamento de rótulos a um DataFrame."""
+    df = df.dropna(subset=DROPNA_COLUMNS)
     X = df[SELECTED_COLUMNS].astype(float).to_numpy()
-    y = df['has_ga'].apply(lambda x: 1 if str(x).lower() == 'true' else 0).to_numpy()
+    y = _label(df[LABEL_COLUMN]).astype(np.int64)
+    return X, y
+
+def _copy_into_npy(raw_path, out_path, shape, dtype, block_rows=CHUNKSIZE):
+    raw = np.memmap(raw_path, dtype=dtype, mode='r', shape=shape) if shape[0] else np.empty(shape, dtype)
+    out = np.lib.format.open_memmap(out_path, mode='w+', dtype=dtype, shape=shape)
+    for start in range(0, shape[0], block_rows):
+        out[start:start + block_rows] = raw[start:start + block_rows]
+    out.flush()
+    del raw, out
+    os.remove(raw_path)
+
+def stream_features(input_path=INPUT_PATH, x_path=X_OUTPUT_PATH, y_path=Y_OUTPUT_PATH, chunksize=CHUNKSIZE):
+    """
+    Extrai X/y lendo o CSV em blocos, com memória limitada pelo tamanho do bloco.
+
+    Apenas SELECTED_COLUMNS + ['has_ga'] são lidas, com features em float32 e
+    rótulos em int8. Cada bloco é anexado a arquivos binários temporários, que
+    no final são copiados para os .npy de saída via memmap.
+
+    Returns:
+        int: Número de linhas gravadas
+    """
+    dtypes = {c: np.float32 for c in SELECTED_COLUMNS}
+    dtypes[LABEL_COLUMN] = str
+    x_raw, y_raw = x_path + '.part', y_path + '.part'
+    n_rows = 0
+    with open(x_raw, 'wb') as fx, open(y_raw, 'wb') as fy:
+        for chunk in pd.read_csv(input_path, usecols=DROPNA_COLUMNS, dtype=dtypes, chunksize=chunksize):
+            chunk = chunk.dropna(subset=DROPNA_COLUMNS)
+            chunk[SELECTED_COLUMNS].to_numpy(dtype=np.float32).tofile(fx)
+            _label(chunk[LABEL_COLUMN]).tofile(fy)
+            n_rows += len(chunk)
+    _copy_into_npy(x_raw, x_path, (n_rows, len(SELECTED_COLUMNS)), np.float32)
+    _copy_into_npy(y_raw, y_path, (n_rows,), np.int8)
+    return n_rows
+
+def load_features(x_path=X_OUTPUT_PATH, y_path=Y_OUTPUT_PATH):
+    """
+    Carregador comum de X/y para o NEAT e o baseline.
+
+    Usa o feature store se existir e estiver atual; senão o CSV via cache
+    incremental (que só processa as linhas novas); sem o CSV, os .npy
+    gerados por ``main`` ou ``stream_features``.
+
+    Returns:
+        tuple: (X, y) como arrays NumPy
+    """
+    from feature_store import store_exists, load_xy
+    from feature_cache import cached_xy
+    if store_exists():
+        return load_xy()
+    if os.path.exists(INPUT_PATH) or not _npy_exists(x_path, y_path):
+        return cached_xy(INPUT_PATH)
+    return np.load(x_path), np.load(y_path)
+
+def _npy_exists(x_path, y_path):
+    return os.path.exists(x_path) and os.path.exists(y_path)
+
+def _npy_current(x_path, y_path):
+    """Os .npy existem e não são anteriores à última modificação do CSV."""
+    if not _npy_exists(x_path, y_path):
+        return False
+    if not os.path.exists(INPUT_PATH):
+        return True
+    return min(os.path.getmtime(x_path), os.path.getmtime(y_path)) >= os.path.getmtime(INPUT_PATH)
+
+def iter_features(chunk_rows=CHUNKSIZE, x_path=X_OUTPUT_PATH, y_path=Y_OUTPUT_PATH):
+    """
+    Itera sobre X/y em blocos de até ``chunk_rows`` linhas, sem carregar o
+    conjunto inteiro: feature store atual, .npy gerados depois da última
+    modificação do CSV ou o próprio CSV, nessa ordem.
+
+    Yields:
+        tuple: (X, y) de cada bloco, com X em float64
+    """
+    from feature_store import store_exists, iter_xy
+    if store_exists():
+        yield from iter_xy(chunk_rows)
+    elif _npy_current(x_path, y_path):
+        X = np.load(x_path, mmap_mode='r')
+        y = np.load(y_path, mmap_mode='r')
+        for start in range(0, len(y), chunk_rows):
+            yield (np.asarray(X[start:start + chunk_rows], dtype=np.float64),
+                   np.asarray(y[start:start + chunk_rows], dtype=np.int64))
+    else:
+        dtypes = {LABEL_COLUMN: str}
+        for chunk in pd.read_csv(INPUT_PATH, usecols=DROPNA_COLUMNS, dtype=dtypes, chunksize=chunk_rows):
+            yield extract_xy(chunk)
+
+def main(use_cache=True):
+    from feature_store import store_exists, load_xy
+    from feature_cache import cached_xy
+    if store_exists():
+        X, y = load_xy()
+    elif use_cache:
+        X, y = cached_xy(INPUT_PATH)
+    else:
+        X, y = extract_xy(pd.read_csv(INPUT_PATH, low_memory=False))
     np.save(X_OUTPUT_PATH, X)
     np.save(Y_OUTPUT_PATH, y)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Gera data/X.npy e data/y.npy a partir do CSV de go-arounds")
+    parser.add_argument("--stream", action="store_true", help="lê o CSV em blocos com memória limitada")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--no-cache", action="store_true", help="ignora o cache incremental de features")
+    args = parser.parse_args()
+    if args.stream:
+        stream_features(chunksize=args.chunksize)
+    else:
+        main(use_cache=not args.no_cache)
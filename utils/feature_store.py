@@ -0,0 +1,235 @@
+"""
+Feature store colunar (Parquet) para os dados de go-around.
+
+Converte o CSV bruto uma única vez em um dataset Parquet particionado e
+comprimido, com o schema e o hash de SELECTED_COLUMNS registrados em
+``_schema.json``. O carregador lê apenas as colunas e partições pedidas,
+sem reinterpretar o texto do CSV a cada execução.
+"""
+
+import os
+import csv
+import json
+import shutil
+import argparse
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from feature_engineering import INPUT_PATH, SELECTED_COLUMNS, LABEL_COLUMN, columns_hash, extract_xy
+
+STORE_PATH = "data/feature_store"
+SCHEMA_FILE = "_schema.json"
+PARTITION_COLUMN = "airport"
+COMPRESSION = "zstd"
+ROW_GROUP_SIZE = 256_000
+
+def store_exists(store_path=STORE_PATH):
+    """
+    Indica se há um feature store atual em ``store_path``.
+
+    Um store cujo CSV de origem mudou depois da conversão é ignorado (com um
+    aviso), e os carregadores voltam a ler o CSV pelo cache incremental.
+    """
+    if not os.path.isfile(os.path.join(store_path, SCHEMA_FILE)):
+        return False
+    if store_is_stale(store_path):
+        print(f"Feature store em {store_path} está desatualizado em relação a "
+              f"{read_schema(store_path)['source']}; usando o CSV "
+              "(execute utils/feature_store.py para atualizá-lo)")
+        return False
+    return True
+
+def read_schema(store_path=STORE_PATH):
+    with open(os.path.join(store_path, SCHEMA_FILE)) as f:
+        return json.load(f)
+
+def store_is_stale(store_path=STORE_PATH):
+    """
+    Compara tamanho e mtime do CSV de origem com os registrados na conversão.
+
+    Returns:
+        bool: True se o CSV mudou; um store sem o CSV de origem é considerado atual
+    """
+    metadata = read_schema(store_path)
+    source = metadata.get('source')
+    if not source or not os.path.exists(source):
+        return False
+    stat = os.stat(source)
+    return stat.st_size != metadata['source_size'] or stat.st_mtime != metadata['source_mtime']
+
+def _count_partitions(input_path, partition_by, read_options):
+    """Valores distintos da coluna de particionamento (lê só essa coluna)."""
+    reader = pv.open_csv(
+        input_path,
+        read_options=read_options,
+        convert_options=pv.ConvertOptions(column_types={partition_by: pa.string()},
+                                          include_columns=[partition_by], strings_can_be_null=True)
+    )
+    values = set()
+    for batch in reader:
+        values.update(pc.unique(batch.column(0)).to_pylist())
+    return max(len(values), 1)
+
+def _open_files_limit(reserve=64):
+    """Arquivos que o writer pode manter abertos sem esgotar o limite do processo."""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except ImportError:
+        return 1024
+    if soft == resource.RLIM_INFINITY:
+        return 1 << 16
+    return max(soft - reserve, 16)
+
+def build_store(input_path=INPUT_PATH, store_path=STORE_PATH, partition_by=PARTITION_COLUMN,
+                compression=COMPRESSION, block_size=64 << 20):
+    """
+    Converte o CSV em um dataset Parquet particionado.
+
+    O CSV é lido em streaming e só SELECTED_COLUMNS, ``has_ga`` e a coluna
+    de particionamento são convertidas; as features são gravadas como float64
+    (mesma precisão de ``feature_engineering.main``) e ``has_ga`` e a
+    partição como texto, preservando o mapeamento de rótulos original. O
+    dataset é gravado em ``store_path + '.tmp'`` e só substitui o store
+    anterior depois de completo.
+
+    Args:
+        input_path (str): CSV de origem
+        store_path (str): Diretório do dataset
+        partition_by (str): Coluna de particionamento (ignorada se ausente do CSV)
+        compression (str): Codec Parquet
+        block_size (int): Bytes de CSV lidos por bloco
+
+    Returns:
+        dict: Metadados gravados em ``_schema.json``
+    """
+    with open(input_path, newline='') as f:
+        header = next(csv.reader(f))
+    if not partition_by or partition_by not in header:
+        partition_by = None
+    # Só as colunas usadas, todas com tipo fixo: nada é inferido bloco a bloco
+    column_types = {c: pa.float64() for c in SELECTED_COLUMNS}
+    column_types[LABEL_COLUMN] = pa.string()
+    if partition_by:
+        column_types[partition_by] = pa.string()
+    read_options = pv.ReadOptions(block_size=block_size)
+    reader = pv.open_csv(
+        input_path,
+        read_options=read_options,
+        convert_options=pv.ConvertOptions(column_types=column_types, include_columns=list(column_types),
+                                          strings_can_be_null=True)
+    )
+    schema = reader.schema
+    partitioning = None
+    partitions = 1
+    if partition_by:
+        partitioning = ds.partitioning(pa.schema([schema.field(partition_by)]), flavor="hive")
+        partitions = _count_partitions(input_path, partition_by, read_options)
+
+    # Gravado ao lado e trocado no fim: uma falha não apaga o store anterior
+    tmp_path = store_path + '.tmp'
+    if os.path.isdir(tmp_path):
+        shutil.rmtree(tmp_path)
+    ds.write_dataset(
+        reader,
+        tmp_path,
+        format="parquet",
+        partitioning=partitioning,
+        file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=min(ROW_GROUP_SIZE, 16_384),
+        max_partitions=max(partitions, 1024),
+        max_open_files=min(partitions, _open_files_limit())
+    )
+
+    stat = os.stat(input_path)
+    metadata = {
+        'source': input_path,
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'schema': {field.name: str(field.type) for field in schema},
+        'selected_columns': SELECTED_COLUMNS,
+        'selected_columns_hash': columns_hash(),
+        'partition_by': partition_by,
+        'compression': compression
+    }
+    with open(os.path.join(tmp_path, SCHEMA_FILE), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    old_path = store_path + '.old'
+    if os.path.isdir(store_path):
+        if os.path.isdir(old_path):
+            shutil.rmtree(old_path)
+        os.rename(store_path, old_path)
+    os.rename(tmp_path, store_path)
+    if os.path.isdir(old_path):
+        shutil.rmtree(old_path)
+    return metadata
+
+def open_store(store_path=STORE_PATH):
+    """Abre o dataset validando o hash de SELECTED_COLUMNS e a data do CSV de origem."""
+    metadata = read_schema(store_path)
+    if metadata['selected_columns_hash'] != columns_hash():
+        raise ValueError(
+            f"Feature store em {store_path} foi gerado com outras SELECTED_COLUMNS; "
+            "execute utils/feature_store.py novamente"
+        )
+    if store_is_stale(store_path):
+        raise ValueError(
+            f"Feature store em {store_path} é anterior à versão atual de {metadata['source']}; "
+            "execute utils/feature_store.py novamente"
+        )
+    partitioning = "hive" if metadata['partition_by'] else None
+    return ds.dataset(store_path, format="parquet", partitioning=partitioning)
+
+def load_frame(columns=None, filter=None, store_path=STORE_PATH):
+    """
+    Carrega colunas selecionadas do feature store.
+
+    Args:
+        columns (list, optional): Colunas a ler (None lê todas)
+        filter (pyarrow.dataset.Expression, optional): Filtro aplicado às
+            partições e row groups, ex.: ``ds.field('airport') == 'LSZH'``
+        store_path (str): Diretório do dataset
+
+    Returns:
+        pandas.DataFrame: Dados carregados
+    """
+    return open_store(store_path).to_table(columns=columns, filter=filter).to_pandas()
+
+def load_xy(filter=None, store_path=STORE_PATH, dtype=np.float64):
+    """
+    Monta X/y a partir do feature store com a mesma política de
+    ``feature_engineering.main`` (dropna e mapeamento de ``has_ga``).
+
+    Returns:
+        tuple: (X, y) como arrays NumPy
+    """
+    df = load_frame(SELECTED_COLUMNS + [LABEL_COLUMN], filter=filter, store_path=store_path)
+    X, y = extract_xy(df)
+    return X.astype(dtype, copy=False), y
+
+def iter_xy(batch_rows=ROW_GROUP_SIZE, filter=None, store_path=STORE_PATH, dtype=np.float64):
+    """
+    Itera sobre X/y do feature store em lotes, sem materializar a tabela inteira.
+
+    Yields:
+        tuple: (X, y) de cada lote (após o dropna, pode ter menos linhas)
+    """
+    dataset = open_store(store_path)
+    for batch in dataset.to_batches(columns=SELECTED_COLUMNS + [LABEL_COLUMN], filter=filter,
+                                    batch_size=batch_rows):
+        if batch.num_rows:
+            X, y = extract_xy(batch.to_pandas())
+            yield X.astype(dtype, copy=False), y
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte o CSV de go-arounds em um feature store Parquet")
+    parser.add_argument("--input", default=INPUT_PATH)
+    parser.add_argument("--output", default=STORE_PATH)
+    parser.add_argument("--partition-by", default=PARTITION_COLUMN)
+    parser.add_argument("--compression", default=COMPRESSION)
+    args = parser.parse_args()
+    build_store(args.input, args.output, args.partition_by, args.compression)
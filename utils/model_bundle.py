@@ -0,0 +1,134 @@
+"""
+Bundle versionado de modelo: scaler + ordem das features + modelo treinado.
+
+O bundle é um único ``.npz`` sem objetos pickle do NumPy: média e escala do
+``StandardScaler`` como arrays, metadados em JSON e o modelo (genoma NEAT ou
+RandomForest) serializado em bytes. Ao carregar, o hash da lista de features
+e o checksum do modelo são verificados, e a ordem das features é conferida
+contra SELECTED_COLUMNS (ou a lista esperada pelo chamador).
+"""
+
+import os
+import json
+import pickle
+import hashlib
+from datetime import datetime
+
+import numpy as np
+
+from feature_engineering import SELECTED_COLUMNS, columns_hash
+
+FORMAT_VERSION = 1
+
+
+def _bytes_array(data):
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+class ModelBundle(object):
+    """
+    Modelo pronto para inferência, com o pré-processamento embutido.
+
+    Args:
+        model: Objeto do modelo (``neat.DefaultGenome`` ou estimador sklearn)
+        model_type (str): ``'neat'`` ou ``'random_forest'``
+        features (list): Ordem das colunas de entrada
+        scaler_mean (numpy.ndarray): ``StandardScaler.mean_``
+        scaler_scale (numpy.ndarray): ``StandardScaler.scale_``
+        metadata (dict, optional): Metadados extras (ex.: texto da config NEAT)
+    """
+
+    def __init__(self, model, model_type, features, scaler_mean, scaler_scale, metadata=None):
+        self.model = model
+        self.model_type = model_type
+        self.features = list(features)
+        self.scaler_mean = np.asarray(scaler_mean, dtype=np.float64)
+        self.scaler_scale = np.asarray(scaler_scale, dtype=np.float64)
+        self.metadata = dict(metadata or {})
+
+    @classmethod
+    def from_scaler(cls, model, model_type, scaler, features=SELECTED_COLUMNS, **metadata):
+        """Cria o bundle a partir de um ``StandardScaler`` já ajustado."""
+        return cls(model, model_type, features, scaler.mean_, scaler.scale_, metadata)
+
+    def transform(self, X):
+        """Aplica a mesma normalização do ``StandardScaler`` de treino."""
+        return (np.asarray(X, dtype=np.float64) - self.scaler_mean) / self.scaler_scale
+
+    def save(self, path, compress=False):
+        """
+        Grava o bundle em ``path`` (``.npz``).
+
+        Args:
+            path (str): Arquivo de saída
+            compress (bool): Usa ``np.savez_compressed`` (recomendado para
+                florestas, cujo pickle é grande e muito compressível)
+
+        Returns:
+            dict: Metadados gravados
+        """
+        model_bytes = pickle.dumps(self.model, protocol=pickle.HIGHEST_PROTOCOL)
+        metadata = dict(self.metadata)
+        metadata.update({
+            'format_version': FORMAT_VERSION,
+            'model_type': self.model_type,
+            'features': self.features,
+            'features_hash': columns_hash(self.features),
+            'model_sha256': hashlib.sha256(model_bytes).hexdigest(),
+            'created': datetime.now().isoformat(timespec='seconds')
+        })
+        savez = np.savez_compressed if compress else np.savez
+        # Grava ao lado e troca atomicamente: o scoring_service pode recarregar
+        # o arquivo a qualquer momento (/reload, SIGHUP)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            savez(
+                f,
+                scaler_mean=self.scaler_mean,
+                scaler_scale=self.scaler_scale,
+                metadata=_bytes_array(json.dumps(metadata).encode()),
+                model=_bytes_array(model_bytes)
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return metadata
+
+    @classmethod
+    def load(cls, path, features=SELECTED_COLUMNS):
+        """
+        Carrega e valida um bundle.
+
+        Args:
+            path (str): Arquivo ``.npz``
+            features (list, optional): Ordem esperada das features (None
+                aceita a ordem gravada)
+
+        Returns:
+            ModelBundle: Bundle carregado
+
+        Raises:
+            ValueError: Versão desconhecida, schema de features divergente ou
+                checksum do modelo inválido
+        """
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(data['metadata'].tobytes())
+            model_bytes = data['model'].tobytes()
+            scaler_mean = data['scaler_mean']
+            scaler_scale = data['scaler_scale']
+
+        if metadata.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Versão de bundle não suportada: {metadata.get('format_version')}")
+        if metadata['features_hash'] != columns_hash(metadata['features']):
+            raise ValueError("Bundle corrompido: hash das features não confere")
+        if features is not None and metadata['features_hash'] != columns_hash(features):
+            raise ValueError(
+                f"Bundle treinado com features {metadata['features']}, esperado {list(features)}"
+            )
+        if hashlib.sha256(model_bytes).hexdigest() != metadata['model_sha256']:
+            raise ValueError("Bundle corrompido: checksum do modelo não confere")
+
+        extra = {k: v for k, v in metadata.items()
+                 if k not in ('model_type', 'features')}
+        return cls(pickle.loads(model_bytes), metadata['model_type'], metadata['features'],
+                   scaler_mean, scaler_scale, extra)